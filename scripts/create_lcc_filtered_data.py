@@ -12,10 +12,17 @@ This ensures consistency across all analyses.
 
 import sys
 from pathlib import Path
+import numpy as np
 import pandas as pd
-import networkx as nx
+import pyarrow.parquet as pq
+from scipy.sparse.csgraph import connected_components
 
 project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from network_tox.analysis.expression_weighted_rwr import adjacency_from_edges
+from network_tox.utils.data_loader import PARQUET_OPTIONS, load_gtex_liver
+
 DATA_DIR = project_root / 'data'
 GTEX_FILE = DATA_DIR / 'raw' / 'GTEx_Analysis_2017-06-05_v8_RNASeQCv1.1.9_gene_median_tpm.gct'
 MIN_TPM = 1.0
@@ -26,51 +33,68 @@ print("=" * 80)
 
 # 1. Load and filter GTEx liver expression
 print("\n[1/6] Loading GTEx liver expression (TPM ≥ 1)...")
-df_gtex = pd.read_csv(GTEX_FILE, sep='\t', skiprows=2)
+df_gtex = load_gtex_liver(GTEX_FILE)
 
-liver_genes = {}
-for _, row in df_gtex.iterrows():
-    gene = row.get('Description', row.get('Name', ''))
-    tpm = row.get('Liver', 0)
-    if gene and pd.notna(tpm) and tpm >= MIN_TPM:
-        liver_genes[gene] = float(tpm)
+mask = df_gtex['Liver'].ge(MIN_TPM) & df_gtex['Description'].notna()
+sub = df_gtex.loc[mask, ['Description', 'Liver']]
+liver_genes = dict(zip(sub['Description'].to_numpy(), sub['Liver'].to_numpy()))
 
 print(f"  Genes with liver TPM ≥ {MIN_TPM}: {len(liver_genes)}")
 
 # Save liver_proteome.csv
-liver_df = pd.DataFrame([
-    {'gene_symbol': g, 'liver_tpm': t} 
-    for g, t in liver_genes.items()
-]).sort_values('liver_tpm', ascending=False)
+# Built from the filtered frame directly; keep='last' matches the dict above
+# for the few symbols GTEx lists twice
+liver_df = (
+    sub.drop_duplicates('Description', keep='last')
+    .rename(columns={'Description': 'gene_symbol', 'Liver': 'liver_tpm'})
+    .astype({'liver_tpm': 'float32'})
+    .sort_values('liver_tpm', ascending=False, kind='stable')
+    .reset_index(drop=True)
+)
 
 liver_file = DATA_DIR / 'processed' / 'liver_proteome.csv'
 liver_df.to_csv(liver_file, index=False)
-print(f"  ✓ Saved: {liver_file}")
+liver_df.to_parquet(liver_file.with_suffix('.parquet'), index=False, **PARQUET_OPTIONS)
+print(f"  ✓ Saved: {liver_file} (+ .parquet)")
 
 # 2. Load STRING networks
+# Sparse adjacency (NetworkX node order) instead of NetworkX graphs
 print("\n[2/6] Loading STRING networks...")
-df700 = pd.read_parquet(DATA_DIR / 'processed' / 'network_700.parquet')
-G700_full = nx.from_pandas_edgelist(df700, 'gene1', 'gene2')
-print(f"  Network 700: {G700_full.number_of_nodes()} nodes, {G700_full.number_of_edges()} edges")
-
-df900 = pd.read_parquet(DATA_DIR / 'processed' / 'network_900.parquet')
-G900_full = nx.from_pandas_edgelist(df900, 'protein1', 'protein2')
-print(f"  Network 900: {G900_full.number_of_nodes()} nodes, {G900_full.number_of_edges()} edges")
 
-# 3. Create liver-filtered LCC for each network
-print("\n[3/6] Creating liver-filtered LCC networks...")
+def load_network(path, col1, col2):
+    """Edge list plus its CSR adjacency and node array."""
+    # Project to the endpoint columns in Arrow; scores are never read
+    df = pq.read_table(path, columns=[col1, col2]).to_pandas()
+    adj, nodes = adjacency_from_edges(df[col1], df[col2])
+    n_edges = (adj.nnz + np.count_nonzero(adj.diagonal())) // 2
+    return df, adj, np.asarray(nodes, dtype=object), n_edges
 
-def get_liver_lcc(G, liver_genes):
+def get_liver_lcc(adj, nodes, liver_genes):
     """Filter network to liver genes and extract LCC."""
-    liver_nodes = [n for n in G.nodes() if n in liver_genes]
-    G_liver = G.subgraph(liver_nodes).copy()
-    if len(G_liver) == 0:
+    keep = np.flatnonzero(pd.Index(nodes).isin(list(liver_genes)))
+    if len(keep) == 0:
         return set()
-    lcc = max(nx.connected_components(G_liver), key=len)
-    return lcc
+    # Induced liver subgraph, labelled by SciPy's compiled BFS; components
+    # are numbered in node order, so ties resolve as with NetworkX
+    _, labels = connected_components(adj[keep][:, keep], directed=False)
+    largest = np.bincount(labels).argmax()
+    return set(nodes[keep[labels == largest]])
+
+def load_liver_lcc(path, col1, col2):
+    """Load one network and find its liver LCC."""
+    df, adj, nodes, n_edges = load_network(path, col1, col2)
+    return df, len(nodes), n_edges, get_liver_lcc(adj, nodes, liver_genes)
 
-lcc_700 = get_liver_lcc(G700_full, liver_genes)
-lcc_900 = get_liver_lcc(G900_full, liver_genes)
+df700, n_nodes_700, n_edges_700, lcc_700 = load_liver_lcc(
+    DATA_DIR / 'processed' / 'network_700.parquet', 'gene1', 'gene2')
+df900, n_nodes_900, n_edges_900, lcc_900 = load_liver_lcc(
+    DATA_DIR / 'processed' / 'network_900.parquet', 'protein1', 'protein2')
+
+print(f"  Network 700: {n_nodes_700} nodes, {n_edges_700} edges")
+print(f"  Network 900: {n_nodes_900} nodes, {n_edges_900} edges")
+
+# 3. Create liver-filtered LCC for each network
+print("\n[3/6] Creating liver-filtered LCC networks...")
 
 print(f"  Liver LCC (700): {len(lcc_700)} nodes")
 print(f"  Liver LCC (900): {len(lcc_900)} nodes")
@@ -82,19 +106,59 @@ print(f"  In BOTH LCCs: {len(lcc_both)} nodes")
 # 4. Save liver LCC networks
 print("\n[4/6] Saving liver LCC networks...")
 
+def lcc_edges(df, col1, col2, lcc):
+    """
+    Edges of df with both endpoints in lcc, one row per undirected edge.
+    
+    Rows come out in the order and orientation of
+    nx.from_pandas_edgelist(df, col1, col2).edges(), so graphs rebuilt from
+    the saved file keep the same node order (and seeded permutations the
+    same draws).
+    """
+    # Node codes in graph insertion order: both endpoints, row by row
+    endpoints = np.column_stack([df[col1].to_numpy(), df[col2].to_numpy()]).ravel()
+    codes, genes = pd.factorize(endpoints)
+    u, v = codes[0::2], codes[1::2]
+    # The earlier-inserted endpoint comes first, as edges() reports it
+    a, b = np.minimum(u, v), np.maximum(u, v)
+    first = ~pd.DataFrame({'a': a, 'b': b}).duplicated().to_numpy()
+    in_lcc = pd.Index(genes).isin(lcc)
+    keep = first & in_lcc[a] & in_lcc[b]
+    a, b = a[keep], b[keep]
+    # edges() walks nodes in insertion order and each node's neighbours in
+    # the order their first row linked them
+    order = np.argsort(a, kind='stable')
+    return pd.DataFrame({'gene1': genes[a[order]], 'gene2': genes[b[order]]})
+
+def save_int_edges(edges_df, path):
+    """Write int32 src/dst node IDs plus a node_id -> gene_symbol table."""
+    # Node IDs follow first appearance, as adjacency_from_edges numbers them
+    endpoints = np.column_stack([edges_df['gene1'].to_numpy(), edges_df['gene2'].to_numpy()]).ravel()
+    codes, genes = pd.factorize(endpoints)
+    codes = codes.astype(np.int32)
+    edges_file = path.with_name(f'{path.stem}_int.parquet')
+    nodes_file = path.with_name(f'{path.stem}_nodes.parquet')
+    pd.DataFrame({'src': codes[0::2], 'dst': codes[1::2]}).to_parquet(
+        edges_file, index=False, **PARQUET_OPTIONS)
+    pd.DataFrame({'node_id': np.arange(len(genes), dtype=np.int32), 'gene_symbol': genes}).to_parquet(
+        nodes_file, index=False, **PARQUET_OPTIONS)
+    return edges_file, nodes_file
+
 # For network 700
-edges_700 = [(u, v) for u, v in G700_full.edges() if u in lcc_700 and v in lcc_700]
-lcc_700_df = pd.DataFrame(edges_700, columns=['gene1', 'gene2'])
+lcc_700_df = lcc_edges(df700, 'gene1', 'gene2', lcc_700)
 lcc_700_file = DATA_DIR / 'processed' / 'network_700_liver_lcc.parquet'
-lcc_700_df.to_parquet(lcc_700_file)
-print(f"  ✓ Saved: {lcc_700_file} ({len(edges_700)} edges)")
+lcc_700_df.to_parquet(lcc_700_file, index=False, **PARQUET_OPTIONS)
+print(f"  ✓ Saved: {lcc_700_file} ({len(lcc_700_df)} edges)")
+int_700_file, _ = save_int_edges(lcc_700_df, lcc_700_file)
+print(f"  ✓ Saved: {int_700_file} (+ _nodes.parquet)")
 
 # For network 900
-edges_900 = [(u, v) for u, v in G900_full.edges() if u in lcc_900 and v in lcc_900]
-lcc_900_df = pd.DataFrame(edges_900, columns=['gene1', 'gene2'])
+lcc_900_df = lcc_edges(df900, 'protein1', 'protein2', lcc_900)
 lcc_900_file = DATA_DIR / 'processed' / 'network_900_liver_lcc.parquet'
-lcc_900_df.to_parquet(lcc_900_file)
-print(f"  ✓ Saved: {lcc_900_file} ({len(edges_900)} edges)")
+lcc_900_df.to_parquet(lcc_900_file, index=False, **PARQUET_OPTIONS)
+print(f"  ✓ Saved: {lcc_900_file} ({len(lcc_900_df)} edges)")
+int_900_file, _ = save_int_edges(lcc_900_df, lcc_900_file)
+print(f"  ✓ Saved: {int_900_file} (+ _nodes.parquet)")
 
 # 5. Load and filter targets to LCC
 print("\n[5/6] Filtering targets to liver LCC...")
@@ -111,29 +175,27 @@ print(f"  Hyperforin: {len(hyp_lcc)}/{len(hyp_all)} in liver LCC")
 print(f"  Quercetin: {len(quer_lcc)}/{len(quer_all)} in liver LCC")
 
 # Create targets_lcc.csv
-lcc_targets = []
-for gene in sorted(hyp_lcc):
-    lcc_targets.append({
-        'gene_symbol': gene,
-        'compound': 'Hyperforin',
-        'liver_tpm': liver_genes.get(gene, 0.0),
-        'in_lcc_700': gene in lcc_700,
-        'in_lcc_900': gene in lcc_900
-    })
-
-for gene in sorted(quer_lcc):
-    lcc_targets.append({
-        'gene_symbol': gene,
-        'compound': 'Quercetin',
-        'liver_tpm': liver_genes.get(gene, 0.0),
-        'in_lcc_700': gene in lcc_700,
-        'in_lcc_900': gene in lcc_900
-    })
-
-targets_lcc_df = pd.DataFrame(lcc_targets)
+# Arrow-backed string index: sorting and isin run in Arrow kernels
+genes = pd.Index(list(hyp_lcc), dtype='string[pyarrow]').sort_values().append(
+    pd.Index(list(quer_lcc), dtype='string[pyarrow]').sort_values()
+).rename('gene_symbol')
+
+# Membership flags filled column by column into one boolean block
+flag_sets = {'in_lcc_700': lcc_700, 'in_lcc_900': lcc_900}
+flags = np.empty((len(genes), len(flag_sets)), dtype=bool)
+for j, ref in enumerate(flag_sets.values()):
+    flags[:, j] = genes.isin(ref)
+
+targets_lcc_df = pd.DataFrame({
+    'compound': pd.Categorical(['Hyperforin'] * len(hyp_lcc) + ['Quercetin'] * len(quer_lcc)),
+    'liver_tpm': genes.map(liver_genes).fillna(0.0).astype('float32'),
+}, index=genes).join(
+    pd.DataFrame(flags, columns=list(flag_sets), index=genes)
+).reset_index()
 targets_lcc_file = DATA_DIR / 'processed' / 'targets_lcc.csv'
 targets_lcc_df.to_csv(targets_lcc_file, index=False)
-print(f"  ✓ Saved: {targets_lcc_file}")
+targets_lcc_df.to_parquet(targets_lcc_file.with_suffix('.parquet'), index=False, **PARQUET_OPTIONS)
+print(f"  ✓ Saved: {targets_lcc_file} (+ .parquet)")
 
 # 6. Summary
 print("\n" + "=" * 80)
@@ -146,10 +208,10 @@ Files Created/Updated:
      → {len(liver_df)} genes with liver TPM ≥ {MIN_TPM}
 
   2. {lcc_700_file}
-     → Liver LCC network (700): {len(lcc_700)} nodes, {len(edges_700)} edges
+     → Liver LCC network (700): {len(lcc_700)} nodes, {len(lcc_700_df)} edges
 
   3. {lcc_900_file}
-     → Liver LCC network (900): {len(lcc_900)} nodes, {len(edges_900)} edges
+     → Liver LCC network (900): {len(lcc_900)} nodes, {len(lcc_900_df)} edges
 
   4. {targets_lcc_file}
      → Hyperforin: {len(hyp_lcc)} targets in liver LCC
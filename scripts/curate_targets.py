@@ -8,12 +8,18 @@ Usage:
     python scripts/curate_targets.py
 """
 
+import re
+import sys
 import pandas as pd
-import gzip
 from pathlib import Path
-from tqdm import tqdm
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from network_tox.utils.data_loader import load_protein_to_gene
 
 DATA_DIR = Path('data')
+# Human UniProt IDs start with P, Q, or O followed by 5 digits
+HUMAN_UNIPROT_PATTERN = re.compile(r'[PQO]\d{5}')
 
 def load_string_protein_info():
     """Load protein ID to gene symbol mapping from STRING."""
@@ -24,21 +30,15 @@ def load_string_protein_info():
         print(f"WARNING: {info_file} not found. Skipping STRING validation.")
         return None
     
-    protein_to_gene = {}
-    with gzip.open(info_file, 'rt') as f:
-        # Skip header
-        f.readline()
-        
-        for line in tqdm(f, desc="  Parsing STRING info"):
-            parts = line.strip().split('\t')
-            if len(parts) >= 2:
-                protein_id = parts[0]  # e.g., "9606.ENSP00000000233"
-                gene_symbol = parts[1]  # e.g., "ARF5"
-                
-                # Extract just the ENSP ID for UniProt matching
-                if protein_id.startswith('9606.'):
-                    ensp_id = protein_id.replace('9606.', '')
-                    protein_to_gene[ensp_id] = gene_symbol
+    # Parsed once, then read back from the Parquet cache on later runs
+    mapping = load_protein_to_gene(info_file)
+    
+    # Keep human entries, keyed by just the ENSP ID for UniProt matching
+    protein_to_gene = {
+        protein_id[len('9606.'):]: gene_symbol
+        for protein_id, gene_symbol in mapping.items()
+        if protein_id.startswith('9606.')
+    }
     
     print(f"  Loaded {len(protein_to_gene):,} protein-gene mappings from STRING")
     return protein_to_gene
@@ -75,14 +75,8 @@ def curate_targets(raw_file, output_file):
     print("\n2. Filter: Human proteins only...")
     print("   Keeping proteins with UniProt human prefixes (P*, Q*, O*)")
     
-    def is_human_protein(protein_id):
-        """Check if protein ID looks like human UniProt."""
-        # Human UniProt IDs start with P, Q, or O followed by 5 digits
-        if len(protein_id) == 6 and protein_id[0] in ['P', 'Q', 'O']:
-            return protein_id[1:].isdigit()
-        return False
-    
-    df['is_human'] = df['protein_id'].apply(is_human_protein)
+    # One compiled pattern over the whole column, no per-row Python call
+    df['is_human'] = df['protein_id'].str.fullmatch(HUMAN_UNIPROT_PATTERN, na=False)
     non_human = df[~df['is_human']]
     
     print(f"   Non-human proteins: {len(non_human)}")
@@ -120,21 +114,22 @@ def curate_targets(raw_file, output_file):
         # ... (this would be loaded from a file in production)
     }
     
-    df['gene_name'] = df['protein_id'].map(gene_mapping)
-    unmapped = df[df['gene_name'].isna()]
-    print(f"   Unmapped proteins: {len(unmapped)}")
-    
-    # For unmapped, try to use protein ID as placeholder
-    # In production, fetch from UniProt API
-    df.loc[df['gene_name'].isna(), 'gene_name'] = 'UNMAPPED_' + df.loc[df['gene_name'].isna(), 'protein_id']
+    # One left join against the mapping table; gene symbols repeat across
+    # compounds, so keep them categorical
+    mapping_df = pd.DataFrame(list(gene_mapping.items()), columns=['protein_id', 'gene_name'])
+    df = df.merge(mapping_df, on='protein_id', how='left')
+    df['gene_name'] = df['gene_name'].astype('category')
+    is_unmapped = df['gene_name'].isna()
+    unmapped_count = int(is_unmapped.sum())
+    print(f"   Unmapped proteins: {unmapped_count}")
     
     # Filter 3: Remove unmapped proteins (if desired)
+    # In production, fetch the missing symbols from the UniProt API
     print("\n4. Filter: Remove unmapped proteins...")
-    unmapped_count = df['gene_name'].str.startswith('UNMAPPED').sum()
     print(f"   Unmapped: {unmapped_count}")
     
     # Keep only mapped for now
-    df = df[~df['gene_name'].str.startswith('UNMAPPED')].copy()
+    df = df[~is_unmapped]
     stats['unmapped'] = unmapped_count
     print(f"   Remaining: {len(df)} targets")
     
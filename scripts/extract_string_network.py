@@ -6,27 +6,26 @@ Usage:
     python scripts/extract_string_network.py --threshold 700 --output data/processed/network_700.parquet
 """
 
-import gzip
+import sys
+import numpy as np
 import pandas as pd
+from pyarrow import csv as pacsv, compute as pc
 import argparse
 from pathlib import Path
 from tqdm import tqdm
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from network_tox.core.network import LINKS_COLUMNS
+from network_tox.utils.data_loader import PARQUET_OPTIONS, load_protein_to_gene
+
+
 def load_string_info(info_file):
     """Load STRING protein info and create protein_id -> gene_symbol mapping."""
     print(f"Loading STRING info from {info_file}...")
     
-    protein_to_gene = {}
-    with gzip.open(info_file, 'rt') as f:
-        # Skip header
-        _ = f.readline()  # noqa: F841
-        
-        for line in tqdm(f, desc="  Parsing protein info"):
-            parts = line.strip().split('\t')
-            if len(parts) >= 2:
-                protein_id = parts[0]  # e.g., "9606.ENSP00000000233"
-                gene_symbol = parts[1]  # e.g., "ARF5"
-                protein_to_gene[protein_id] = gene_symbol
+    # Parsed once, then read back from the Parquet cache on later runs
+    protein_to_gene = load_protein_to_gene(info_file)
     
     print(f"  Loaded {len(protein_to_gene):,} protein-gene mappings")
     return protein_to_gene
@@ -35,65 +34,68 @@ def extract_network(links_file, protein_to_gene, threshold, output_file):
     """Extract network from STRING links with confidence threshold."""
     print(f"\nExtracting network from {links_file} (threshold >= {threshold})...")
     
-    edges = []
+    # Arrow streams the gzip in record batches, decompressing and parsing on
+    # its own threads; each batch is then filtered and mapped column-wise
+    reader = pacsv.open_csv(
+        links_file,
+        parse_options=pacsv.ParseOptions(delimiter=' '),
+        convert_options=pacsv.ConvertOptions(column_types=LINKS_COLUMNS),
+    )
+    gene_of = pd.Series(protein_to_gene, dtype=object)
+    
+    parts = []
     skipped_unmapped = 0
     skipped_self_loops = 0
     
-    with gzip.open(links_file, 'rt') as f:
-        # Skip header
-        _ = f.readline()  # noqa: F841
+    for batch in tqdm(reader, desc="  Parsing links", unit=" batches"):
+        # Filter by confidence threshold
+        batch = batch.filter(pc.greater_equal(batch['combined_score'], threshold))
+        chunk = batch.to_pandas()
         
-        for line in tqdm(f, desc="  Parsing links"):
-            parts = line.strip().split()
-            if len(parts) >= 3:
-                protein1 = parts[0]
-                protein2 = parts[1]
-                score = int(parts[2])
-                
-                # Filter by confidence threshold
-                if score < threshold:
-                    continue
-                
-                # Map to gene symbols
-                gene1 = protein_to_gene.get(protein1)
-                gene2 = protein_to_gene.get(protein2)
-                
-                if gene1 is None or gene2 is None:
-                    skipped_unmapped += 1
-                    continue
-                
-                # Skip self-loops
-                if gene1 == gene2:
-                    skipped_self_loops += 1
-                    continue
-                
-                # Ensure consistent edge direction (alphabetical)
-                if gene1 > gene2:
-                    gene1, gene2 = gene2, gene1
-                
-                edges.append({
-                    'gene1': gene1,
-                    'gene2': gene2,
-                    'score': score
-                })
-    
-    print(f"\n  Edges passing threshold: {len(edges):,}")
+        # Map to gene symbols
+        gene1 = chunk['protein1'].map(gene_of)
+        gene2 = chunk['protein2'].map(gene_of)
+        mapped = (gene1.notna() & gene2.notna()).to_numpy()
+        skipped_unmapped += int((~mapped).sum())
+        gene1 = gene1.to_numpy()[mapped]
+        gene2 = gene2.to_numpy()[mapped]
+        score = chunk['combined_score'].to_numpy()[mapped]
+        
+        # Skip self-loops
+        loop = gene1 == gene2
+        skipped_self_loops += int(loop.sum())
+        gene1, gene2, score = gene1[~loop], gene2[~loop], score[~loop]
+        
+        # Ensure consistent edge direction (alphabetical)
+        swap = gene1 > gene2
+        parts.append(pd.DataFrame({
+            'gene1': np.where(swap, gene2, gene1),
+            'gene2': np.where(swap, gene1, gene2),
+            'score': score,
+        }))
+    
+    df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    
+    print(f"\n  Edges passing threshold: {len(df):,}")
     print(f"  Skipped (unmapped proteins): {skipped_unmapped:,}")
     print(f"  Skipped (self-loops): {skipped_self_loops:,}")
     
-    # Create dataframe and remove duplicates
-    df = pd.DataFrame(edges)
-    
     if len(df) > 0:
         # Remove duplicate edges (keep highest score)
         df = df.sort_values('score', ascending=False)
-        df = df.drop_duplicates(subset=['gene1', 'gene2'], keep='first')
+        # Hash each gene pair as one int64 key built from factorized
+        # endpoint codes instead of hashing two strings per row
+        n = len(df)
+        codes, genes = pd.factorize(np.concatenate([df['gene1'].to_numpy(), df['gene2'].to_numpy()]))
+        pair = codes[:n].astype(np.int64) * len(genes) + codes[n:]
+        df = df[~pd.Series(pair).duplicated(keep='first').to_numpy()]
         
         print(f"  After deduplication: {len(df):,} edges")
-        print(f"  Unique genes: {len(set(df['gene1']) | set(df['gene2'])):,}")
+        # Dropping duplicate pairs removes no genes
+        print(f"  Unique genes: {len(genes):,}")
         
         # Save to parquet
-        df.to_parquet(output_file, index=False)
+        df.to_parquet(output_file, index=False, **PARQUET_OPTIONS)
         print(f"\n✓ Saved to {output_file}")
     else:
         print("\n✗ No edges found!")
@@ -5,13 +5,15 @@ Usage:
     python scripts/filter_liver_network.py --input data/processed/network_900_raw.parquet --output data/processed/network_900.parquet
 """
 
+import numpy as np
 import pandas as pd
-import networkx as nx
 import argparse
 import sys
+from pathlib import Path
 
 sys.path.append('src')
-from network_tox.core.network import filter_to_tissue
+from network_tox.core.network import largest_component_nodes
+from network_tox.utils.data_loader import PARQUET_OPTIONS
 
 def filter_network(input_file, liver_genes_file, output_file):
     """Filter network to liver genes and extract LCC."""
@@ -32,23 +34,26 @@ def filter_network(input_file, liver_genes_file, output_file):
     liver_genes = set(liver_df['gene_symbol'])
     print(f"  Liver genes: {len(liver_genes):,}")
     
-    # Create graph
+    # Work on the edge list throughout: drop edges with a non-liver
+    # endpoint, take the largest component with SciPy and keep its edges.
+    # No NetworkX graph is built.
     print("\nFiltering to liver-expressed genes...")
-    G = nx.from_pandas_edgelist(df, col1, col2)
-    G_liver = filter_to_tissue(G, liver_genes)
+    liver_edges = df.loc[df[col1].isin(liver_genes) & df[col2].isin(liver_genes), [col1, col2]]
+    lcc = largest_component_nodes(liver_edges[col1], liver_edges[col2])
+    lcc_edges = liver_edges[liver_edges[col1].isin(lcc)]
     
-    print(f"  Nodes after liver filter: {G_liver.number_of_nodes():,}")
-    print(f"  Edges after liver filter: {G_liver.number_of_edges():,}")
+    # One row per undirected edge, as a graph would hold them
+    u = lcc_edges[col1].to_numpy()
+    v = lcc_edges[col2].to_numpy()
+    swap = u > v
+    pairs = pd.DataFrame({'a': np.where(swap, v, u), 'b': np.where(swap, u, v)})
+    df_filtered = lcc_edges[~pairs.duplicated().to_numpy()].reset_index(drop=True)
     
-    # Convert back to dataframe
-    edges = []
-    for u, v in G_liver.edges():
-        edges.append({col1: u, col2: v})
-    
-    df_filtered = pd.DataFrame(edges)
+    print(f"  Nodes after liver filter: {len(lcc):,}")
+    print(f"  Edges after liver filter: {len(df_filtered):,}")
     
     # Save
-    df_filtered.to_parquet(output_file, index=False)
+    df_filtered.to_parquet(output_file, index=False, **PARQUET_OPTIONS)
     print(f"\n✓ Saved filtered network to {output_file}")
     
     return df_filtered
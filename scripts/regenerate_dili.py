@@ -9,11 +9,27 @@ Usage:
     python scripts/regenerate_dili.py
 """
 
+import sys
 import pandas as pd
-import networkx as nx
 from pathlib import Path
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv, compute as pc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from network_tox.utils.data_loader import PARQUET_OPTIONS
 
 DATA_DIR = Path('data')
+DILI_DISEASE = 'Drug-Induced Liver Injury'
+# Explicit types so every streamed block parses the same way
+DILI_COLUMNS = {
+    'geneSymbol': pa.string(),
+    'geneId': pa.int64(),
+    'score': pa.float64(),
+    'diseaseName': pa.string(),
+    'diseaseId': pa.string(),
+}
 
 
 def main():
@@ -33,14 +49,28 @@ def main():
     print(f"[1] Loading DisGeNET curated associations...")
     print(f"    Source: {source_file}")
     
-    curated = pd.read_csv(source_file, sep='\t')
-    print(f"    Total associations: {len(curated)}")
+    # Stream the TSV in Arrow record batches, keeping only DILI rows from
+    # each batch so the full association table is never held in memory
+    reader = pacsv.open_csv(
+        source_file,
+        parse_options=pacsv.ParseOptions(delimiter='\t'),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(DILI_COLUMNS),
+            column_types=DILI_COLUMNS,
+        ),
+    )
+    n_total = 0
+    dili_batches = []
+    for batch in reader:
+        n_total += batch.num_rows
+        dili_batches.append(batch.filter(pc.equal(batch['diseaseName'], DILI_DISEASE)))
+    print(f"    Total associations: {n_total}")
     
     # Step 2: Filter for Drug-Induced Liver Injury
     print()
     print("[2] Filtering for Drug-Induced Liver Injury (DILI)...")
     
-    dili = curated[curated['diseaseName'] == 'Drug-Induced Liver Injury'].copy()
+    dili = pa.Table.from_batches(dili_batches, schema=reader.schema).to_pandas()
     print(f"    DILI associations: {len(dili)}")
     
     # Step 3: Create unique gene list
@@ -51,6 +81,9 @@ def main():
     dili_genes_df = dili_genes_df.rename(columns={'geneSymbol': 'gene_name'})
     dili_genes_df = dili_genes_df.drop_duplicates(subset=['gene_name'])
     dili_genes_df = dili_genes_df.sort_values('score', ascending=False)
+    # Single-valued labels: dictionary-encoded in the Parquet outputs
+    label_cols = ['diseaseName', 'diseaseId']
+    dili_genes_df[label_cols] = dili_genes_df[label_cols].astype('category')
     
     print(f"    Unique DILI genes: {len(dili_genes_df)}")
     print(f"    Top 10 genes: {list(dili_genes_df['gene_name'].head(10))}")
@@ -82,14 +115,16 @@ def main():
             print(f"    WARNING: {net_file} not found, skipping")
             continue
         
-        net_df = pd.read_parquet(net_file)
-        
-        if 'gene1' in net_df.columns:
-            G = nx.from_pandas_edgelist(net_df, 'gene1', 'gene2')
+        if 'gene1' in pq.read_schema(net_file).names:
+            col1, col2 = 'gene1', 'gene2'
         else:
-            G = nx.from_pandas_edgelist(net_df, 'protein1', 'protein2')
+            col1, col2 = 'protein1', 'protein2'
         
-        lcc_nodes = set(G.nodes())
+        # Only node membership is needed here: read the two endpoint
+        # columns and take their unique values in Arrow, skipping pandas
+        edges = pq.read_table(net_file, columns=[col1, col2])
+        endpoints = pa.chunked_array(edges[col1].chunks + edges[col2].chunks)
+        lcc_nodes = set(pc.unique(endpoints).to_pylist())
         print(f"    LCC nodes: {len(lcc_nodes)}")
         
         # Filter DILI genes to LCC
@@ -100,8 +135,9 @@ def main():
         
         lcc_path = DATA_DIR / 'processed' / f'dili_{threshold}_lcc.csv'
         dili_lcc.to_csv(lcc_path, index=False)
+        dili_lcc.to_parquet(lcc_path.with_suffix('.parquet'), index=False, **PARQUET_OPTIONS)
         
-        print(f"    Saved: {lcc_path}")
+        print(f"    Saved: {lcc_path} (+ .parquet)")
         print(f"    DILI genes in LCC: {len(dili_lcc)}/{len(dili_genes_df)}")
     
     # Summary
@@ -115,8 +151,8 @@ def main():
     print()
     print("Generated files:")
     print(f"  - data/raw/dili_genes_raw.csv ({len(dili_genes_df)} genes)")
-    print(f"  - data/processed/dili_700_lcc.csv")
-    print(f"  - data/processed/dili_900_lcc.csv")
+    print(f"  - data/processed/dili_700_lcc.csv / .parquet")
+    print(f"  - data/processed/dili_900_lcc.csv / .parquet")
     print()
     print("Done!")
 
@@ -14,15 +14,15 @@ GENE_STANDARDIZATION = {
 }
 
 # Known non-human proteins by UniProt ID or gene
-NON_HUMAN_PATTERNS = {
+NON_HUMAN_PATTERNS = (
     # Mouse UniProt prefixes
     'Q91',   # Mouse
     'Q9D',   # Mouse
     'Q63',   # Rat
     'Q965D', # Rat UGT family
-}
+)
 
-NON_HUMAN_GENES = {
+NON_HUMAN_GENES = frozenset({
     'GyrA',     # E. coli DNA gyrase
     'HPV16E6', # Human papillomavirus (not human protein)
     'NSP5',     # SARS-CoV-2
@@ -33,7 +33,7 @@ NON_HUMAN_GENES = {
     'Ugt1a7',   # Rat UGT
     'Ugt1a8',   # Mouse UGT
     'Ugt1a9',   # Rat UGT
-}
+})
 
 
 def load_mapping():
@@ -55,22 +55,18 @@ def load_mapping():
     return mapping
 
 
-def is_non_human(protein_id: str, gene: str) -> bool:
-    """Check if protein is non-human based on ID pattern or gene name."""
+def non_human_mask(protein_ids: pd.Series, genes: pd.Series) -> pd.Series:
+    """Flag proteins that are non-human based on ID pattern or gene name."""
     # Check UniProt ID prefix
-    for prefix in NON_HUMAN_PATTERNS:
-        if protein_id.startswith(prefix):
-            return True
+    by_prefix = protein_ids.str.startswith(NON_HUMAN_PATTERNS)
     
     # Check gene name
-    if gene in NON_HUMAN_GENES:
-        return True
+    by_gene = genes.isin(NON_HUMAN_GENES)
     
     # Lowercase gene names often indicate non-human
-    if gene and gene[0].islower():
-        return True
+    by_case = genes.str[:1].str.islower().fillna(False)
     
-    return False
+    return by_prefix | by_gene | by_case
 
 
 def main():
@@ -90,40 +86,28 @@ def main():
     
     # Apply filters
     print("\n[3/4] Applying filters...")
-    results = []
-    stats = {'no_mapping': 0, 'non_human': 0, 'kept': 0}
-    
-    for _, row in raw.iterrows():
-        pid = row['protein_id']
-        compound = row['compound']
-        source = row['source']
-        
-        # Filter 1: Must have mapping
-        if pid not in mapping:
-            stats['no_mapping'] += 1
-            continue
-        
-        gene = mapping[pid]
-        
-        # Filter 2: Must be human
-        if is_non_human(pid, gene):
-            stats['non_human'] += 1
-            continue
-        
-        results.append({
-            'compound': compound,
-            'protein_id': pid,
-            'source': source,
-            'gene_name': gene
-        })
-        stats['kept'] += 1
+    genes = raw['protein_id'].map(mapping)
+    
+    # Filter 1: Must have mapping
+    has_mapping = genes.notna()
+    
+    # Filter 2: Must be human
+    non_human = has_mapping & non_human_mask(raw['protein_id'], genes.fillna(''))
+    
+    keep = has_mapping & ~non_human
+    stats = {
+        'no_mapping': int((~has_mapping).sum()),
+        'non_human': int(non_human.sum()),
+        'kept': int(keep.sum()),
+    }
     
     print(f"      No mapping: {stats['no_mapping']}")
     print(f"      Non-human: {stats['non_human']}")
     print(f"      Kept: {stats['kept']}")
     
     # Create DataFrame
-    df = pd.DataFrame(results)
+    df = raw.loc[keep, ['compound', 'protein_id', 'source']].assign(gene_name=genes[keep])
+    df = df.reset_index(drop=True)
     
     # Remove duplicates (same compound + protein)
     before_dedup = len(df)
@@ -146,8 +130,8 @@ def main():
     
     print("\nHyperforin targets:")
     hyp = df[df['compound']=='Hyperforin'][['protein_id', 'gene_name']]
-    for _, row in hyp.iterrows():
-        print(f"  {row['protein_id']} -> {row['gene_name']}")
+    for pid, gene in zip(hyp['protein_id'], hyp['gene_name']):
+        print(f"  {pid} -> {gene}")
     
     print("\n" + "=" * 80)
 
@@ -8,13 +8,13 @@ to test if Hyperforin's influence advantage is due to target count.
 
 import pandas as pd
 import numpy as np
-import networkx as nx
 from pathlib import Path
 import sys
 from tqdm import tqdm
 
 sys.path.append('src')
 from network_tox.analysis.rwr import run_rwr
+from network_tox.core.network import load_edgelist_graph
 
 DATA_DIR = Path('data')
 RESULTS_DIR = Path('results')
@@ -42,22 +42,19 @@ def main():
     print()
     
     # Load network
-    net_df = pd.read_parquet(DATA_DIR / 'processed' / 'network_900_liver_lcc.parquet')
-    if 'gene1' in net_df.columns:
-        G = nx.from_pandas_edgelist(net_df, 'gene1', 'gene2')
-    else:
-        G = nx.from_pandas_edgelist(net_df, 'protein1', 'protein2')
+    G = load_edgelist_graph(DATA_DIR / 'processed' / 'network_900_liver_lcc.parquet')
     
     print(f"Network: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
     
     # Load DILI genes
     dili_df = pd.read_csv(DATA_DIR / 'processed' / 'dili_900_lcc.csv')
-    dili_genes = [g for g in dili_df['gene_name'] if g in G]
+    network_nodes = set(G.nodes())
+    dili_genes = dili_df.loc[dili_df['gene_name'].isin(network_nodes), 'gene_name'].tolist()
     print(f"DILI genes in network: {len(dili_genes)}")
     
     # Filter targets to network
-    hyp_in_net = [t for t in hyp_targets if t in G]
-    quer_in_net = [t for t in quer_targets if t in G]
+    hyp_in_net = [t for t in hyp_targets if t in network_nodes]
+    quer_in_net = [t for t in quer_targets if t in network_nodes]
     
     print(f"Hyperforin targets in network: {len(hyp_in_net)}")
     print(f"Quercetin targets in network: {len(quer_in_net)}")
@@ -6,9 +6,12 @@ FDA DILIrank 2.0 Analysis
 
 import sys
 import json
+import threading
 import time
 import urllib.parse
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
@@ -23,6 +26,12 @@ except ImportError:
     print("[ERROR] requests library required. Install: pip install requests")
     sys.exit(1)
 
+# Optional faster JSON codec for the SMILES cache
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
@@ -37,7 +46,8 @@ import numpy as np
 CONFIG = {
     'pubchem_timeout': 15,
     'pubchem_max_retries': 2,
-    'pubchem_delay': 0.1,  # Rate limiting
+    'pubchem_delay': 0.2,  # Minimum seconds between requests (PubChem allows ~5/s)
+    'pubchem_workers': 2,  # Concurrent lookups; requests stay pubchem_delay apart
     'tanimoto_threshold': 0.4,  # Structural analog threshold
     'fingerprint_radius': 2,  # ECFP4
     'fingerprint_bits': 2048,
@@ -139,7 +149,9 @@ def load_smiles_cache() -> Dict[str, str]:
     """Load cached SMILES from disk."""
     if SMILES_CACHE_FILE.exists():
         try:
-            with open(SMILES_CACHE_FILE, 'r') as f:
+            if orjson is not None:
+                return orjson.loads(SMILES_CACHE_FILE.read_bytes())
+            with open(SMILES_CACHE_FILE, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception:
             return {}
@@ -149,13 +161,46 @@ def load_smiles_cache() -> Dict[str, str]:
 def save_smiles_cache(cache: Dict[str, str]):
     """Save SMILES cache to disk."""
     SMILES_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(SMILES_CACHE_FILE, 'w') as f:
-        json.dump(cache, f)
+    if orjson is not None:
+        SMILES_CACHE_FILE.write_bytes(orjson.dumps(cache))
+        return
+    # Serialize first and write once; json.dump issues a write per token.
+    # Compact UTF-8, the same bytes orjson writes
+    SMILES_CACHE_FILE.write_text(
+        json.dumps(cache, separators=(',', ':'), ensure_ascii=False), encoding='utf-8'
+    )
 
 
 # Global cache (loaded once at startup)
 SMILES_CACHE = {}
 
+# One keep-alive session per thread (requests.Session is not thread-safe)
+_SESSIONS = threading.local()
+
+# Start time of the latest PubChem request, across all threads
+_PUBCHEM_LOCK = threading.Lock()
+_last_request = 0.0
+
+
+def pubchem_session() -> requests.Session:
+    """Keep-alive session for PubChem lookups from the current thread."""
+    session = getattr(_SESSIONS, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.verify = False
+        _SESSIONS.session = session
+    return session
+
+
+def wait_for_pubchem_slot():
+    """Block until pubchem_delay has passed since the last request from any thread."""
+    global _last_request
+    with _PUBCHEM_LOCK:
+        wait = _last_request + CONFIG['pubchem_delay'] - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_request = time.monotonic()
+
 
 # =============================================================================
 # PUBCHEM API
@@ -188,11 +233,8 @@ def get_smiles_from_pubchem(compound_name: str, use_cache: bool = True) -> Optio
         
         for _ in range(CONFIG['pubchem_max_retries']):
             try:
-                response = requests.get(
-                    url, 
-                    verify=False, 
-                    timeout=CONFIG['pubchem_timeout']
-                )
+                wait_for_pubchem_slot()
+                response = pubchem_session().get(url, timeout=CONFIG['pubchem_timeout'])
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -206,8 +248,6 @@ def get_smiles_from_pubchem(compound_name: str, use_cache: bool = True) -> Optio
                         
             except Exception:
                 time.sleep(0.3)
-        
-        time.sleep(CONFIG['pubchem_delay'])
     
     # Cache the miss too (as empty string) to avoid retrying
     if use_cache:
@@ -216,14 +256,51 @@ def get_smiles_from_pubchem(compound_name: str, use_cache: bool = True) -> Optio
     return None
 
 
+def prefetch_smiles(compound_names: List[str]) -> int:
+    """
+    Fill SMILES_CACHE for names not yet cached, overlapping PubChem requests.
+    
+    Every request first takes a slot from wait_for_pubchem_slot, so the
+    workers together stay within PubChem's rate limit.
+    
+    Args:
+        compound_names: Drug names to look up (duplicates are ignored)
+        
+    Returns:
+        Number of names fetched from PubChem
+    """
+    missing = [name for name in dict.fromkeys(compound_names) if name not in SMILES_CACHE]
+    if missing:
+        with ThreadPoolExecutor(max_workers=CONFIG['pubchem_workers']) as pool:
+            for i, _ in enumerate(pool.map(get_smiles_from_pubchem, missing), start=1):
+                if i % 50 == 0 or i == len(missing):
+                    print(f"      PubChem: {i}/{len(missing)} ({i / len(missing) * 100:.0f}%)")
+    return len(missing)
+
+
 # =============================================================================
 # FINGERPRINTS & SIMILARITY
 # =============================================================================
 
+@lru_cache(maxsize=1)
+def _morgan_generator():
+    """Morgan fingerprint generator built once from CONFIG."""
+    from rdkit.Chem import rdFingerprintGenerator
+    
+    return rdFingerprintGenerator.GetMorganGenerator(
+        radius=CONFIG['fingerprint_radius'],
+        fpSize=CONFIG['fingerprint_bits']
+    )
+
+
+@lru_cache(maxsize=None)
 def calculate_fingerprint(smiles: str):
     """
     Generate ECFP4 fingerprint from SMILES.
     
+    Results are memoized per SMILES string, so drugs that appear in more
+    than one reference set (or share a salt-stripped parent) are parsed once.
+    
     Args:
         smiles: Canonical SMILES string
         
@@ -232,17 +309,12 @@ def calculate_fingerprint(smiles: str):
     """
     try:
         from rdkit import Chem
-        from rdkit.Chem import AllChem
         
         mol = Chem.MolFromSmiles(smiles)
         if mol is None:
             return None
         
-        return AllChem.GetMorganFingerprintAsBitVect(
-            mol, 
-            radius=CONFIG['fingerprint_radius'], 
-            nBits=CONFIG['fingerprint_bits']
-        )
+        return _morgan_generator().GetFingerprint(mol)
     except Exception:
         return None
 
@@ -318,14 +390,20 @@ def main():
         print("      This will take approximately 15-20 minutes (first run)...")
         print("      Subsequent runs will use cache (~30 seconds)")
     
+    n_fetched = prefetch_smiles(
+        dili_positive_df['CompoundName'].tolist() + dili_negative_df['CompoundName'].tolist()
+    )
+    if n_fetched:
+        print(f"      Fetched {n_fetched} compounds from PubChem")
+    
     def process_drugs(df: pd.DataFrame, label: str) -> List[Dict[str, Any]]:
         """Process a set of drugs: retrieve SMILES and generate fingerprints."""
         results = []
         total = len(df)
         cache_used = 0
         
-        for i, (_, row) in enumerate(df.iterrows()):
-            compound_name = row['CompoundName']
+        rows = zip(df['CompoundName'], df['LTKBID'], df['vDILI-Concern'])
+        for i, (compound_name, ltkbid, dilirank) in enumerate(rows):
             
             # Check if already in cache
             if compound_name in SMILES_CACHE:
@@ -339,8 +417,8 @@ def main():
                 if fp is not None:
                     results.append({
                         'name': compound_name,
-                        'ltkbid': row['LTKBID'],
-                        'dilirank': row['vDILI-Concern'],
+                        'ltkbid': ltkbid,
+                        'dilirank': dilirank,
                         'smiles': smiles,
                         'fingerprint': fp
                     })
@@ -350,10 +428,6 @@ def main():
             if (i + 1) % interval == 0 or (i + 1) == total:
                 pct = (i + 1) / total * 100
                 print(f"      {label}: {i+1}/{total} ({pct:.0f}%) - {len(results)} with SMILES")
-            
-            # Only delay if not using cache
-            if compound_name not in SMILES_CACHE or not SMILES_CACHE.get(compound_name):
-                time.sleep(CONFIG['pubchem_delay'])
         
         return results
     
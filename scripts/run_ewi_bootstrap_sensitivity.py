@@ -16,6 +16,7 @@ from network_tox.analysis.expression_weighted_rwr import (
     load_liver_expression,
     create_expression_weighted_transition_matrix
 )
+from network_tox.core.network import load_edgelist_graph
 
 DATA_DIR = Path('data')
 RESULTS_DIR = Path('results')
@@ -51,8 +52,7 @@ def main():
     SAMPLE_SIZE = len(hyp_targets)
     
     # Load network
-    net_df = pd.read_parquet(DATA_DIR / 'processed' / 'network_900_liver_lcc.parquet')
-    G = nx.from_pandas_edgelist(net_df, 'gene1', 'gene2')
+    G = load_edgelist_graph(DATA_DIR / 'processed' / 'network_900_liver_lcc.parquet')
     nodes = list(G.nodes())
     node_idx = {n: i for i, n in enumerate(nodes)}
     adj = nx.adjacency_matrix(G, nodelist=nodes).astype(float)
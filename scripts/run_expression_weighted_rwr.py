@@ -14,17 +14,20 @@ import sys
 from pathlib import Path
 import numpy as np
 import pandas as pd
-import networkx as nx
+import pyarrow.parquet as pq
 
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
 from network_tox.analysis.expression_weighted_rwr import (
+    adjacency_from_codes,
+    adjacency_from_edges,
     load_liver_expression,
-    run_expression_weighted_rwr,
-    run_standard_rwr,
+    run_expression_weighted_rwr_from_adjacency,
+    run_standard_rwr_from_adjacency,
     compute_dili_influence
 )
+from network_tox.utils.data_loader import load_int_edgelist
 
 
 # =============================================================================
@@ -33,6 +36,8 @@ from network_tox.analysis.expression_weighted_rwr import (
 
 GTEX_FILE = project_root / 'data' / 'raw' / 'GTEx_Analysis_2017-06-05_v8_RNASeQCv1.1.9_gene_median_tpm.gct'
 NETWORK_FILE = project_root / 'data' / 'processed' / 'network_900_liver_lcc.parquet'  # Liver LCC!
+NETWORK_INT_FILE = NETWORK_FILE.with_name('network_900_liver_lcc_int.parquet')
+NETWORK_NODES_FILE = NETWORK_FILE.with_name('network_900_liver_lcc_nodes.parquet')
 TARGETS_FILE = project_root / 'data' / 'processed' / 'targets_lcc.csv'  # 9 Hyp, 62 Quer
 DILI_FILE = project_root / 'data' / 'processed' / 'dili_900_lcc.csv'
 OUTPUT_DIR = project_root / 'results' / 'tables'
@@ -44,6 +49,11 @@ RESTART_PROB = 0.15  # Standard setting per Guney et al. 2016
 # MAIN
 # =============================================================================
 
+def is_fresh(derived, source):
+    """True if derived exists and is at least as new as source."""
+    return derived.exists() and derived.stat().st_mtime >= source.stat().st_mtime
+
+
 def main():
     print("=" * 70)
     print("EXPRESSION-WEIGHTED RWR ANALYSIS")
@@ -51,14 +61,26 @@ def main():
     
     # 1. Load network
     print("\n[1/5] Loading network...")
-    df = pd.read_parquet(NETWORK_FILE)
-    if 'protein1' in df.columns:
-        G = nx.from_pandas_edgelist(df, 'protein1', 'protein2')
-    elif 'gene1' in df.columns:
-        G = nx.from_pandas_edgelist(df, 'gene1', 'gene2')
+    if is_fresh(NETWORK_INT_FILE, NETWORK_FILE) and is_fresh(NETWORK_NODES_FILE, NETWORK_FILE):
+        # Integer-coded copy written by create_lcc_filtered_data.py: same
+        # node order, without hashing any gene names
+        src, dst, nodes = load_int_edgelist(NETWORK_INT_FILE, NETWORK_NODES_FILE)
+        adj = adjacency_from_codes(src, dst, len(nodes))
     else:
-        G = nx.from_pandas_edgelist(df, 'source', 'target')
-    print(f"      Network: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
+        columns = pq.read_schema(NETWORK_FILE).names
+        if 'protein1' in columns:
+            col1, col2 = 'protein1', 'protein2'
+        elif 'gene1' in columns:
+            col1, col2 = 'gene1', 'gene2'
+        else:
+            col1, col2 = 'source', 'target'
+        # Sparse adjacency straight from the edge columns; no NetworkX graph
+        df = pq.read_table(NETWORK_FILE, columns=[col1, col2]).to_pandas()
+        adj, nodes = adjacency_from_edges(df[col1], df[col2])
+    node_set = set(nodes)
+    # Each undirected edge is stored twice, except self-loops
+    n_edges = (adj.nnz + np.count_nonzero(adj.diagonal())) // 2
+    print(f"      Network: {len(nodes)} nodes, {n_edges} edges")
     
     # 2. Load expression
     print("\n[2/5] Loading GTEx liver expression...")
@@ -78,8 +100,8 @@ def main():
     quercetin_targets = list(targets_df[targets_df['compound'] == 'Quercetin']['gene_symbol'])
     
     # Filter to network
-    hyp_in_G = [t for t in hyperforin_targets if t in G]
-    quer_in_G = [t for t in quercetin_targets if t in G]
+    hyp_in_G = [t for t in hyperforin_targets if t in node_set]
+    quer_in_G = [t for t in quercetin_targets if t in node_set]
     
     print(f"      Hyperforin: {len(hyp_in_G)}/{len(hyperforin_targets)} targets in network")
     print(f"      Quercetin: {len(quer_in_G)}/{len(quercetin_targets)} targets in network")
@@ -94,7 +116,7 @@ def main():
     else:
         dili_genes = list(dili_df.iloc[:, 0])
     
-    dili_in_G = [g for g in dili_genes if g in G]
+    dili_in_G = [g for g in dili_genes if g in node_set]
     print(f"      DILI genes: {len(dili_in_G)}/{len(dili_genes)} in network")
     
     # 5. Run RWR comparison
@@ -105,20 +127,20 @@ def main():
     
     for compound, targets in [('Hyperforin', hyp_in_G), ('Quercetin', quer_in_G)]:
         # Standard RWR (uniform restart)
-        scores_standard = run_standard_rwr(G, targets, restart_prob=RESTART_PROB)
+        scores_standard = run_standard_rwr_from_adjacency(adj, nodes, targets, restart_prob=RESTART_PROB)
         influence_standard = compute_dili_influence(scores_standard, dili_in_G)
         
         # Expression-weighted RWR
-        scores_weighted = run_expression_weighted_rwr(
-            G, targets, expression, 
+        scores_weighted = run_expression_weighted_rwr_from_adjacency(
+            adj, nodes, targets, expression,
             restart_prob=RESTART_PROB,
             transform='log1p'
         )
         influence_weighted = compute_dili_influence(scores_weighted, dili_in_G)
         
         # Expression stats for targets
-        target_tpms = [expression.get(t, 0) for t in targets if t in expression]
-        mean_tpm = np.mean(target_tpms) if target_tpms else 0
+        target_tpms = np.fromiter((expression[t] for t in targets if t in expression), dtype=np.float64)
+        mean_tpm = target_tpms.mean() if target_tpms.size else 0
         
         results.append({
             'compound': compound,
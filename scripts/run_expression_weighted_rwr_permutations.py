@@ -9,7 +9,6 @@ import sys
 from pathlib import Path
 import numpy as np
 import pandas as pd
-import networkx as nx
 from tqdm import tqdm
 from statsmodels.stats.multitest import multipletests
 
@@ -17,9 +16,11 @@ project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
 from network_tox.analysis.expression_weighted_rwr import (
-    load_liver_expression,
-    run_expression_weighted_rwr
+    ExpressionWeightedRWR,
+    expression_array,
+    load_liver_expression
 )
+from network_tox.core.network import load_edgelist_graph
 from network_tox.core.permutation import (
     get_degree_matched_random,
     calculate_z_score,
@@ -80,11 +81,11 @@ def run_permutation_test(G, observed_targets, dili_genes, expression, n_perm, de
         z_score: Z-score
         p_value: One-tailed p-value (greater)
     """
+    # Transition matrix is built once and shared by every permutation
+    rwr = ExpressionWeightedRWR.from_graph(G)
+    
     # Observed influence
-    observed_scores = run_expression_weighted_rwr(
-        G, observed_targets, expression,
-        restart_prob=RESTART_PROB
-    )
+    observed_scores = rwr.solve(observed_targets, expression, restart_prob=RESTART_PROB)
     observed_influence = compute_dili_influence(observed_scores, dili_genes)
     
     # Null distribution
@@ -103,10 +104,7 @@ def run_permutation_test(G, observed_targets, dili_genes, expression, n_perm, de
             continue
         
         # Run expression-weighted RWR on random targets
-        random_scores = run_expression_weighted_rwr(
-            G, random_targets, expression,
-            restart_prob=RESTART_PROB
-        )
+        random_scores = rwr.solve(random_targets, expression, restart_prob=RESTART_PROB)
         
         # Compute null influence
         null_influence = compute_dili_influence(random_scores, dili_genes)
@@ -150,19 +148,7 @@ def main():
             print(f"  ERROR: {network_file} not found. Skipping.")
             continue
         
-        df = pd.read_parquet(network_file)
-        
-        # Handle different column naming conventions
-        if 'protein1' in df.columns and 'protein2' in df.columns:
-            G = nx.from_pandas_edgelist(df, 'protein1', 'protein2')
-        elif 'gene1' in df.columns and 'gene2' in df.columns:
-            G = nx.from_pandas_edgelist(df, 'gene1', 'gene2')
-        elif 'source' in df.columns and 'target' in df.columns:
-            G = nx.from_pandas_edgelist(df, 'source', 'target')
-        else:
-            # Fallback: use first two columns
-            cols = df.columns.tolist()
-            G = nx.from_pandas_edgelist(df, cols[0], cols[1])
+        G = load_edgelist_graph(network_file)
         
         print(f"  Network: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
         
@@ -190,7 +176,7 @@ def main():
             
             # Check expression coverage
             targets_with_expression = [t for t in targets_in_network if t in expression]
-            mean_tpm = np.mean([expression.get(t, 0) for t in targets_in_network])
+            mean_tpm = expression_array(expression, targets_in_network).mean()
             print(f"  Targets with expression data: {len(targets_with_expression)}/{len(targets_in_network)}")
             print(f"  Mean target liver TPM: {mean_tpm:.2f}")
             
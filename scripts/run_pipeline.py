@@ -195,8 +195,10 @@ def check_outputs_exist(outputs):
 def run_pipeline(start_step=1, only_step=None, validate_only=False):
     """Run the complete pipeline."""
     
+    # One clock reading for both the printed start time and the elapsed total
+    start_time = time.time()
     print_header("NETWORK TOXICOLOGY PIPELINE")
-    print(f"\nStarted: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\nStarted: {datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Working directory: {Path.cwd()}")
     
     if validate_only:
@@ -211,7 +213,6 @@ def run_pipeline(start_step=1, only_step=None, validate_only=False):
     
     # Track results
     results = []
-    start_time = time.time()
     
     # Filter steps to run
     steps_to_run = [s for s in PIPELINE_STEPS 
@@ -243,7 +244,7 @@ def run_pipeline(start_step=1, only_step=None, validate_only=False):
         if step_info.get('skip_if_exists') and check_outputs_exist(step_info['outputs']):
             print("   Outputs exist, skipping...")
             print_step(step_info, 'SKIP')
-            results.append({'step': step_num, 'status': 'SKIPPED', 'time': 0})
+            results.append({'step': step_num, 'name': step_info['name'], 'status': 'SKIPPED', 'time': 0})
             continue
         
         # Run the step
@@ -257,29 +258,32 @@ def run_pipeline(start_step=1, only_step=None, validate_only=False):
         if success:
             print_step(step_info, 'DONE')
             print(f"   Completed in {elapsed:.1f}s")
-            results.append({'step': step_num, 'status': 'SUCCESS', 'time': elapsed})
+            results.append({'step': step_num, 'name': step_info['name'], 'status': 'SUCCESS', 'time': elapsed})
         else:
             print_step(step_info, 'FAIL')
-            results.append({'step': step_num, 'status': 'FAILED', 'time': elapsed})
+            results.append({'step': step_num, 'name': step_info['name'], 'status': 'FAILED', 'time': elapsed})
             
             if step_info.get('required'):
                 print("\nHALTED: Required step failed")
                 break
     
     # Summary
-    total_time = time.time() - start_time
+    end_time = time.time()
+    total_time = end_time - start_time
     print_header("PIPELINE SUMMARY")
     
-    print("\nResults:")
+    # Assemble the table and write it in one call
+    status_icons = {'SUCCESS': 'OK  ', 'FAILED': 'FAIL', 'SKIPPED': 'SKIP'}
+    lines = ["\nResults:"]
+    failed = []
     for r in results:
-        status_icon = {'SUCCESS': 'OK  ', 'FAILED': 'FAIL', 'SKIPPED': 'SKIP'}[r['status']]
-        step_name = next(s['name'] for s in PIPELINE_STEPS if s['step'] == r['step'])
-        print(f"  [{status_icon}] Step {r['step']}: {step_name} ({r['time']:.1f}s)")
-    
-    failed = [r for r in results if r['status'] == 'FAILED']
+        lines.append(f"  [{status_icons[r['status']]}] Step {r['step']}: {r['name']} ({r['time']:.1f}s)")
+        if r['status'] == 'FAILED':
+            failed.append(r)
+    print("\n".join(lines))
     
     print(f"\nTotal time: {total_time:.1f}s ({total_time/60:.1f} min)")
-    print(f"Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Completed: {datetime.fromtimestamp(end_time).strftime('%Y-%m-%d %H:%M:%S')}")
     
     if failed:
         print(f"\nFAILED: {len(failed)} step(s) failed")
@@ -315,12 +319,13 @@ Examples:
     
     if args.list:
         print_header("PIPELINE STEPS")
+        lines = []
         for step in PIPELINE_STEPS:
-            print(f"\n  Step {step['step']}: {step['name']}")
-            print(f"         {step['description']}")
+            lines.append(f"\n  Step {step['step']}: {step['name']}")
+            lines.append(f"         {step['description']}")
             if step.get('script'):
-                print(f"         Script: {step['script']}")
-        print()
+                lines.append(f"         Script: {step['script']}")
+        print("\n".join(lines) + "\n")
         return 0
     
     return run_pipeline(
@@ -8,7 +8,6 @@ with statistical validation via permutation testing.
 
 import pandas as pd
 import numpy as np
-import networkx as nx
 from pathlib import Path
 from tqdm import tqdm
 from statsmodels.stats.multitest import multipletests
@@ -16,6 +15,8 @@ import sys
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
+from network_tox.analysis.shortest_path import calculate_shortest_path, distances_to_nearest
+from network_tox.core.network import load_edgelist_graph
 from network_tox.core.permutation import calculate_empirical_p_value
 
 import warnings
@@ -33,34 +34,12 @@ RESULTS_DIR = Path('results') / 'tables'
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def calculate_shortest_path(G, targets, disease_genes):
-    """Calculate mean minimum shortest path distance (d_c)."""
-    targets_in = [t for t in targets if t in G]
-    disease_in = [d for d in disease_genes if d in G]
-    
-    if not targets_in or not disease_in:
-        return np.nan
-    
-    distances = []
-    for target in targets_in:
-        min_dist = float('inf')
-        for disease in disease_in:
-            try:
-                dist = nx.shortest_path_length(G, target, disease)
-                min_dist = min(min_dist, dist)
-            except nx.NetworkXNoPath:
-                continue
-        if min_dist != float('inf'):
-            distances.append(min_dist)
-    
-    return np.mean(distances) if distances else np.nan
-
-
-def get_degree_matched_random(G, targets, n_random=1):
+def get_degree_matched_random(G, targets, n_random=1, all_degrees=None):
     """Get random nodes matching the degree distribution of targets."""
-    target_degrees = {t: G.degree(t) for t in targets if t in G}
-    all_nodes = list(G.nodes())
-    all_degrees = {n: G.degree(n) for n in all_nodes}
+    if all_degrees is None:
+        all_degrees = dict(G.degree())
+    target_degrees = {t: all_degrees[t] for t in targets if t in G}
+    all_nodes = list(all_degrees)
     
     random_sets = []
     for _ in range(n_random):
@@ -82,14 +61,19 @@ def get_degree_matched_random(G, targets, n_random=1):
 
 def run_permutation_test(G, targets, disease_genes, n_permutations, compound_name, threshold):
     """Run permutation test for shortest path analysis."""
-    observed = calculate_shortest_path(G, targets, disease_genes)
+    # Distances to the DILI set and the degree table are the same for every
+    # permutation: compute them once and reuse them
+    distances = distances_to_nearest(G, disease_genes)
+    all_degrees = dict(G.degree())
+    
+    observed = calculate_shortest_path(G, targets, disease_genes, distances)
     
     null_distribution = []
     desc = f"{compound_name} (≥{threshold})"
     
     for _ in tqdm(range(n_permutations), desc=desc):
-        random_targets = get_degree_matched_random(G, targets, n_random=1)[0]
-        null_value = calculate_shortest_path(G, random_targets, disease_genes)
+        random_targets = get_degree_matched_random(G, targets, n_random=1, all_degrees=all_degrees)[0]
+        null_value = calculate_shortest_path(G, random_targets, disease_genes, distances)
         if not np.isnan(null_value):
             null_distribution.append(null_value)
     
@@ -140,13 +124,7 @@ def main():
         
         # Load network
         network_file = DATA_DIR / 'processed' / f'network_{threshold}_liver_lcc.parquet'
-        network_df = pd.read_parquet(network_file)
-        
-        # Handle column naming
-        if 'gene1' in network_df.columns:
-            G = nx.from_pandas_edgelist(network_df, 'gene1', 'gene2')
-        else:
-            G = nx.from_pandas_edgelist(network_df, 'protein1', 'protein2')
+        G = load_edgelist_graph(network_file)
         
         print(f"[1] Network: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
         
@@ -154,12 +132,14 @@ def main():
         dili_file = DATA_DIR / 'processed' / f'dili_{threshold}_lcc.csv'
         dili_df = pd.read_csv(dili_file)
         dili_genes = list(dili_df['gene_name'])
-        dili_in_network = [g for g in dili_genes if g in G]
-        print(f"[2] DILI genes: {len(dili_in_network)}/{len(dili_genes)} in network")
+        # One hashed node set per network; coverage counts are isin() sums
+        network_nodes = frozenset(G)
+        n_dili_in = int(dili_df['gene_name'].isin(network_nodes).sum())
+        print(f"[2] DILI genes: {n_dili_in}/{len(dili_genes)} in network")
         print()
         
         for compound, targets in [('Hyperforin', hyp_targets), ('Quercetin', quer_targets)]:
-            targets_in = [t for t in targets if t in G]
+            targets_in = [t for t in targets if t in network_nodes]
             print(f"[3] {compound}: {len(targets_in)}/{len(targets)} targets in network")
             
             result = run_permutation_test(G, targets, dili_genes, N_PERMUTATIONS, compound, threshold)
@@ -15,7 +15,6 @@ import sys
 from pathlib import Path
 import numpy as np
 import pandas as pd
-import networkx as nx
 from tqdm import tqdm
 from statsmodels.stats.multitest import multipletests
 
@@ -23,6 +22,7 @@ project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
 from network_tox.analysis.expression_weighted_rwr import run_standard_rwr
+from network_tox.core.network import load_edgelist_graph
 from network_tox.core.permutation import (
     get_degree_matched_random,
     calculate_z_score,
@@ -134,17 +134,7 @@ def main():
             print(f"  ERROR: {network_file} not found. Skipping.")
             continue
         
-        df = pd.read_parquet(network_file)
-        
-        if 'protein1' in df.columns and 'protein2' in df.columns:
-            G = nx.from_pandas_edgelist(df, 'protein1', 'protein2')
-        elif 'gene1' in df.columns and 'gene2' in df.columns:
-            G = nx.from_pandas_edgelist(df, 'gene1', 'gene2')
-        elif 'source' in df.columns and 'target' in df.columns:
-            G = nx.from_pandas_edgelist(df, 'source', 'target')
-        else:
-            cols = df.columns.tolist()
-            G = nx.from_pandas_edgelist(df, cols[0], cols[1])
+        G = load_edgelist_graph(network_file)
         
         print(f"  Network: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
         
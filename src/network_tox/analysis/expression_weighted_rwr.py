@@ -8,9 +8,16 @@ weighting based on protein expression.
 import numpy as np
 import networkx as nx
 from scipy import sparse
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from pathlib import Path
 
+# Optional JIT for the RWR iteration; SciPy SpMV is used otherwise
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 def load_liver_expression(
     gtex_file: Union[str, Path],
@@ -26,28 +33,117 @@ def load_liver_expression(
     Returns:
         Dictionary mapping gene_symbol -> TPM value
     """
-    import pandas as pd
+    import pyarrow as pa
+    from pyarrow import csv as pacsv, compute as pc
     
     # GTEx .gct format: skip first 2 rows (version, dimensions)
     # Columns: Name, Description, then tissue columns
-    df = pd.read_csv(gtex_file, sep='\t', skiprows=2)
-    
-    if tissue_column not in df.columns:
-        raise ValueError(f"Tissue '{tissue_column}' not found. Available: {df.columns.tolist()}")
+    with open(gtex_file) as f:
+        f.readline()
+        f.readline()
+        columns = f.readline().rstrip('\n').split('\t')
+    
+    if tissue_column not in columns:
+        raise ValueError(f"Tissue '{tissue_column}' not found. Available: {columns}")
+    
+    # Arrow's multi-threaded parser, restricted to the two columns used
+    table = pacsv.read_csv(
+        gtex_file,
+        read_options=pacsv.ReadOptions(skip_rows=2),
+        parse_options=pacsv.ParseOptions(delimiter='\t'),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=['Description', tissue_column],
+            column_types={'Description': pa.string(), tissue_column: pa.float64()},
+        ),
+    )
     
     # Use Description column as gene symbol (more readable than ENSG ID)
-    expression = {}
-    for _, row in df.iterrows():
-        gene_symbol = row.get('Description', row.get('Name', ''))
-        tpm = row.get(tissue_column, 0)
-        if gene_symbol and pd.notna(tpm):
-            expression[gene_symbol] = float(tpm)
+    symbols = table['Description']
+    tpm = table[tissue_column]
+    keep = pc.and_(pc.not_equal(symbols, ''), pc.is_valid(tpm))
+    table = table.filter(keep)
+    
+    # Later rows win for repeated symbols, as with per-row assignment
+    return dict(zip(table['Description'].to_pylist(), table[tissue_column].to_pylist()))
+
+
+def _adj_csr(G: nx.Graph, nodelist: List[str]) -> sparse.csr_array:
+    """
+    Float64 CSR adjacency of G in nodelist order.
+    
+    Built in one step by NetworkX rather than ``adjacency_matrix().astype(float)``,
+    which allocates the matrix twice.
+    """
+    return nx.to_scipy_sparse_array(G, nodelist=nodelist, dtype=np.float64, format='csr')
+
+
+def adjacency_from_edges(
+    sources: Sequence[str],
+    targets: Sequence[str]
+) -> Tuple[sparse.csr_array, List[str]]:
+    """
+    Build a symmetric unweighted CSR adjacency straight from an edge list.
+    
+    Equivalent to ``nx.from_pandas_edgelist`` followed by an adjacency matrix
+    for unweighted networks, without creating the NetworkX graph: nodes are
+    ordered by first appearance, and repeated or reversed edges collapse to 1.
+    
+    Args:
+        sources: First endpoint of each edge
+        targets: Second endpoint of each edge
+        
+    Returns:
+        (adjacency, nodes) where row/column i of adjacency is nodes[i]
+    """
+    import pandas as pd
+    
+    # Interleave endpoints so factorize numbers nodes in NetworkX insertion order
+    endpoints = np.column_stack([np.asarray(sources), np.asarray(targets)]).ravel()
+    codes, uniques = pd.factorize(endpoints)
+    
+    adj = adjacency_from_codes(codes[0::2], codes[1::2], len(uniques))
+    return adj, uniques.tolist()
+
+
+def adjacency_from_codes(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    n: int
+) -> sparse.csr_array:
+    """
+    Build a symmetric unweighted CSR adjacency from integer node IDs.
+    
+    Args:
+        rows: Node ID of the first endpoint of each edge
+        cols: Node ID of the second endpoint of each edge
+        n: Number of nodes
+        
+    Returns:
+        n x n adjacency; repeated or reversed edges collapse to 1
+    """
+    adj = sparse.csr_array(
+        (np.ones(2 * len(rows)), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(n, n)
+    )
+    adj.sum_duplicates()
+    adj.data[:] = 1.0
+    return adj
+
+
+def expression_array(expression: Dict[str, float], nodes: List[str]) -> np.ndarray:
+    """
+    Align an expression dictionary to node order (missing genes get 0.0).
     
-    return expression
+    Build this once per network and pass it in place of the dictionary to
+    avoid repeating the per-node lookups.
+    """
+    return np.fromiter(
+        (expression.get(node, 0.0) for node in nodes), dtype=np.float64, count=len(nodes)
+    )
 
 
 def normalize_expression_values(
-    expression: Dict[str, float],
+    expression: Union[Dict[str, float], np.ndarray],
     nodes: List[str],
     method: str = "minmax"
 ) -> np.ndarray:
@@ -55,7 +151,8 @@ def normalize_expression_values(
     Normalize expression values to [0, 1] range for transition weighting.
     
     Args:
-        expression: Dictionary mapping gene -> TPM value
+        expression: Dictionary mapping gene -> TPM value, or an array already
+            aligned to nodes (see expression_array)
         nodes: List of all network nodes
         method: Normalization method ('minmax' or 'log_minmax')
         
@@ -63,7 +160,12 @@ def normalize_expression_values(
         Array of normalized expression values (length = len(nodes))
     """
     n = len(nodes)
-    expr_values = np.array([expression.get(node, 0.0) for node in nodes])
+    if isinstance(expression, np.ndarray):
+        if len(expression) != n:
+            raise ValueError(f"Expression array has {len(expression)} values for {n} nodes")
+        expr_values = expression.astype(np.float64)
+    else:
+        expr_values = expression_array(expression, nodes)
     
     if method == "log_minmax":
         # Log-transform then min-max normalize
@@ -88,29 +190,100 @@ def normalize_expression_values(
 
 def create_expression_weighted_transition_matrix(
     adj_matrix: sparse.spmatrix,
-    expression: Dict[str, float],
+    expression: Union[Dict[str, float], np.ndarray],
     nodes: List[str]
 ) -> sparse.spmatrix:
     """
     Create transition matrix weighted by source node expression.
-    """
-    n = len(nodes)
     
-    # Normalize expression to [0, 1]
-    expr_normalized = normalize_expression_values(expression, nodes, method="log_minmax")
-    
-    # Weight each ROW by destination node expression: A'_ij = e_i * A_ij
-    # This attracts signal to highly-expressed proteins (destination-node weighting)
-    expr_diag = sparse.diags(expr_normalized)
-    weighted_adj = expr_diag.dot(adj_matrix)
+    expression may be a gene -> TPM dictionary or an array aligned to nodes.
+    """
+    return ExpressionWeightedRWR(adj_matrix, nodes).transition_matrix(expression)
+
+
+class ExpressionWeightedRWR:
+    """
+    Expression-weighted RWR on a fixed network.
     
-    # Column-normalize: each column sums to 1
-    col_sum = np.array(weighted_adj.sum(axis=0)).flatten()
-    col_sum[col_sum == 0] = 1.0  # Avoid division by zero
-    d_inv = sparse.diags(1.0 / col_sum)
-    W_prime = weighted_adj.dot(d_inv)
+    Holds the CSC adjacency and its column layout, so each new expression
+    profile only rescales the stored values, and repeated solves with the
+    same expression object (e.g. permutations over seed sets) reuse the
+    normalized transition matrix. Mutating that object between solves is
+    not detected; pass a new dictionary or array instead.
+    """
     
-    return W_prime
+    def __init__(self, adj: sparse.spmatrix, nodes: List[str]):
+        self.nodes = list(nodes)
+        self.node_idx = {node: i for i, node in enumerate(self.nodes)}
+        self._adj = sparse.csc_array(adj, dtype=np.float64, copy=True)
+        self._counts = np.diff(self._adj.indptr)
+        self._nonempty = self._counts > 0
+        self._expression = None
+        self._W_csr = None
+    
+    @classmethod
+    def from_graph(cls, G: nx.Graph) -> "ExpressionWeightedRWR":
+        """Build from a NetworkX graph, in G.nodes() order."""
+        nodes = list(G.nodes())
+        return cls(_adj_csr(G, nodes), nodes)
+    
+    def transition_matrix(
+        self,
+        expression: Union[Dict[str, float], np.ndarray]
+    ) -> sparse.csc_array:
+        """Column-stochastic W' for one expression profile (CSC)."""
+        adj = self._adj
+        n = len(self.nodes)
+        
+        # Normalize expression to [0, 1]
+        expr_normalized = normalize_expression_values(expression, self.nodes, method="log_minmax")
+        
+        # Weight each ROW by destination node expression: A'_ij = e_i * A_ij
+        # This attracts signal to highly-expressed proteins (destination-node weighting)
+        # In CSC layout .indices holds the row of each stored entry
+        data = adj.data * expr_normalized[adj.indices]
+        
+        # Column-normalize: each column sums to 1
+        # Columns are contiguous runs of .data, so sum each run with reduceat
+        col_sum = np.ones(n)
+        if adj.nnz:
+            col_sum[self._nonempty] = np.add.reduceat(data, adj.indptr[:-1][self._nonempty])
+        col_sum[col_sum == 0] = 1.0  # Avoid division by zero
+        data *= np.repeat(1.0 / col_sum, self._counts)
+        
+        return sparse.csc_array((data, adj.indices.copy(), adj.indptr.copy()), shape=adj.shape)
+    
+    def solve(
+        self,
+        seeds: List[str],
+        expression: Union[Dict[str, float], np.ndarray],
+        restart_prob: float = 0.15,
+        tol: float = 1e-6,
+        max_iter: int = 100
+    ) -> Dict[str, float]:
+        """Expression-weighted RWR scores from a uniform restart over seeds."""
+        n = len(self.nodes)
+        if n == 0:
+            return {}
+        
+        if self._W_csr is None or expression is not self._expression:
+            # Row-major copy for the SpMV, made once per expression profile
+            self._W_csr = self.transition_matrix(expression).tocsr()
+            self._expression = expression
+        
+        # Create UNIFORM restart vector over targets (not expression-weighted)
+        q = np.zeros(n)
+        valid_seeds = [s for s in seeds if s in self.node_idx]
+        
+        if not valid_seeds:
+            return {node: 0.0 for node in self.nodes}
+        
+        for seed in valid_seeds:
+            q[self.node_idx[seed]] = 1.0 / len(valid_seeds)
+        
+        p = _cumulative_power_iteration(self._W_csr, q, restart_prob, tol, max_iter)
+        
+        return dict(zip(self.nodes, p.tolist()))
 
 
 def run_expression_weighted_rwr(
@@ -123,45 +296,99 @@ def run_expression_weighted_rwr(
 ) -> Dict[str, float]:
     """
     Run expression-weighted Random Walk with Restart.
+    
+    For many runs on the same graph, build an ExpressionWeightedRWR once
+    and call its solve method instead.
     """
     if len(G) == 0:
         return {}
     
-    # Create indexing
-    nodes = list(G.nodes())
-    node_idx = {n: i for i, n in enumerate(nodes)}
-    n = len(nodes)
-    
-    adj = nx.adjacency_matrix(G, nodelist=nodes).astype(float)
-    
-    W_prime = create_expression_weighted_transition_matrix(
-        adj_matrix=adj,
-        expression=expression,
-        nodes=nodes
+    return ExpressionWeightedRWR.from_graph(G).solve(
+        seeds, expression, restart_prob=restart_prob, tol=tol, max_iter=max_iter
     )
+
+
+def run_expression_weighted_rwr_from_adjacency(
+    adj: sparse.spmatrix,
+    nodes: List[str],
+    seeds: List[str],
+    expression: Union[Dict[str, float], np.ndarray],
+    restart_prob: float = 0.15,
+    tol: float = 1e-6,
+    max_iter: int = 100
+) -> Dict[str, float]:
+    """
+    Expression-weighted RWR on a prebuilt adjacency (see adjacency_from_edges).
     
-    # Create UNIFORM restart vector over targets (not expression-weighted)
-    r = np.zeros((n, 1))
-    valid_seeds = [s for s in seeds if s in node_idx]
-    
-    if not valid_seeds:
-        return {node: 0.0 for node in nodes}
-    
-    for seed in valid_seeds:
-        r[node_idx[seed]] = 1.0 / len(valid_seeds)
-    
-    # Initialize p with restart vector
-    p = r.copy()
+    Same result as run_expression_weighted_rwr on the equivalent graph, without
+    going through NetworkX.
+    """
+    return ExpressionWeightedRWR(adj, nodes).solve(
+        seeds, expression, restart_prob=restart_prob, tol=tol, max_iter=max_iter
+    )
+
+
+def _cumulative_power_iteration(
+    W_csr: sparse.csr_array,
+    q: np.ndarray,
+    restart_prob: float,
+    tol: float,
+    max_iter: int
+) -> np.ndarray:
+    """
+    Solve p = (1-c) W p + c q by cumulative power iteration.
     
-    # Iterate until convergence (standard RWR iteration)
+    The stationary vector is p = c * sum_k ((1-c) W)^k q, so accumulate the
+    terms of the series until the newest one carries less than tol of
+    probability mass. Uses the numba kernel when numba is installed.
+    """
+    if NUMBA_AVAILABLE:
+        return _cpi_csr_jit(
+            W_csr.indptr, W_csr.indices, W_csr.data.astype(np.float64, copy=False),
+            q, restart_prob, tol, max_iter
+        )
+    
+    x = restart_prob * q
+    p = x.copy()
     for iteration in range(max_iter):
-        p_new = (1 - restart_prob) * W_prime.dot(p) + restart_prob * r
-        diff = np.sum(np.abs(p_new - p))
-        p = p_new
-        if diff < tol:
+        x = W_csr.dot(x)
+        x *= 1 - restart_prob
+        p += x
+        if np.abs(x).sum() < tol:
             break
+    return p
+
+
+def _cpi_csr(indptr, indices, data, q, restart_prob, tol, max_iter):
+    """
+    Cumulative power iteration on raw CSR arrays.
     
-    return {nodes[i]: float(p[i, 0]) for i in range(n)}
+    Same recurrence as the SciPy loop in _cumulative_power_iteration, with
+    the SpMV, accumulation and L1 norm fused into one pass per iteration.
+    Written in plain Python/NumPy so numba can compile it unchanged.
+    """
+    n = q.shape[0]
+    x = restart_prob * q
+    p = x.copy()
+    y = np.empty(n)
+    for _ in range(max_iter):
+        mass = 0.0
+        for i in range(n):
+            acc = 0.0
+            for k in range(indptr[i], indptr[i + 1]):
+                acc += data[k] * x[indices[k]]
+            acc *= 1 - restart_prob
+            y[i] = acc
+            p[i] += acc
+            mass += abs(acc)
+        x, y = y, x
+        if mass < tol:
+            break
+    return p
+
+
+if NUMBA_AVAILABLE:
+    _cpi_csr_jit = njit(cache=True)(_cpi_csr)
 
 
 def compute_dili_influence(
@@ -178,7 +405,10 @@ def compute_dili_influence(
     Returns:
         Total influence score (sum of steady-state probabilities)
     """
-    return sum(rwr_scores.get(gene, 0.0) for gene in dili_genes)
+    scores = np.fromiter(
+        (rwr_scores.get(gene, 0.0) for gene in dili_genes), dtype=np.float64, count=len(dili_genes)
+    )
+    return float(scores.sum())
 
 
 # =============================================================================
@@ -201,15 +431,32 @@ def run_standard_rwr(
         return {}
     
     nodes = list(G.nodes())
-    node_idx = {n: i for i, n in enumerate(nodes)}
+    return run_standard_rwr_from_adjacency(
+        _adj_csr(G, nodes), nodes, seeds,
+        restart_prob=restart_prob, tol=tol, max_iter=max_iter
+    )
+
+
+def run_standard_rwr_from_adjacency(
+    adj: sparse.spmatrix,
+    nodes: List[str],
+    seeds: List[str],
+    restart_prob: float = 0.15,
+    tol: float = 1e-6,
+    max_iter: int = 100
+) -> Dict[str, float]:
+    """
+    Standard RWR on a prebuilt adjacency (see adjacency_from_edges).
+    """
     n = len(nodes)
+    if n == 0:
+        return {}
+    node_idx = {node: i for i, node in enumerate(nodes)}
     
-    adj = nx.adjacency_matrix(G, nodelist=nodes).astype(float)
-    
-    col_sum = np.array(adj.sum(axis=0)).flatten()
+    col_sum = np.array(adj.sum(axis=0), dtype=np.float64).flatten()
     col_sum[col_sum == 0] = 1
-    d_inv = sparse.diags(1.0 / col_sum)
-    W = adj.dot(d_inv)
+    # Scale column j by 1/col_sum[j] via broadcasting (no diagonal matrix product)
+    W = sparse.csr_array(adj.multiply(1.0 / col_sum), dtype=np.float64)
     
     # Uniform restart vector
     r = np.zeros((n, 1))
@@ -265,8 +512,13 @@ def get_degree_matched_random_seeds(
     if not valid_seeds:
         return []
     
-    # Get all nodes with expression data
-    expressed_nodes = [n for n in nodes_in_G if n in expression]
+    # Get all nodes with expression data (graph order, so results are
+    # reproducible under a fixed random.seed) and their degrees as one array
+    expressed_nodes = [n for n in G.nodes() if n in expression]
+    degrees = np.fromiter(
+        (d for _, d in G.degree(expressed_nodes)), dtype=np.int64, count=len(expressed_nodes)
+    )
+    taken = np.zeros(len(expressed_nodes), dtype=bool)
     
     random_seeds = []
     for seed in valid_seeds:
@@ -275,17 +527,14 @@ def get_degree_matched_random_seeds(
         max_degree = int(seed_degree * (1 + degree_tolerance))
         
         # Find candidates with matching degree and expression
-        candidates = [
-            n for n in expressed_nodes
-            if min_degree <= G.degree(n) <= max_degree and n not in random_seeds
-        ]
+        candidates = np.flatnonzero((degrees >= min_degree) & (degrees <= max_degree) & ~taken)
         
-        if candidates:
-            random_seeds.append(random.choice(candidates))
-        else:
+        if len(candidates) == 0:
             # Fallback: any expressed node
-            fallback = [n for n in expressed_nodes if n not in random_seeds]
-            if fallback:
-                random_seeds.append(random.choice(fallback))
+            candidates = np.flatnonzero(~taken)
+        if len(candidates):
+            pick = random.choice(candidates)
+            taken[pick] = True
+            random_seeds.append(expressed_nodes[pick])
     
     return random_seeds
@@ -2,7 +2,6 @@
 
 import numpy as np
 import networkx as nx
-from scipy import sparse
 
 def run_rwr(G, seeds, restart_prob=0.15, tol=1e-6, max_iter=100):
     """
@@ -37,14 +36,13 @@ def run_rwr(G, seeds, restart_prob=0.15, tol=1e-6, max_iter=100):
     col_sum = np.array(adj.sum(axis=0)).flatten()
     # Avoid division by zero
     col_sum[col_sum == 0] = 1
-    # Create diagonal matrix of inverse degrees
-    d_inv = sparse.diags(1.0 / col_sum)
     # W = A * D^-1 (column normalized)
     # Note: Traditional definition is often W = D^-1 A (row normalized) or W = A D^-1 (column normalized)
     # The formula p = (1-a)W p + a r usually implies p is a column vector and W is column stochastic.
     # So if p_j is prob at node j, flow from j to i is M_ij * p_j.
     # M_ij = A_ij / deg(j). So W = A * D^-1.
-    W = adj.dot(d_inv)
+    # Broadcasting 1/deg over columns avoids building the diagonal D^-1.
+    W = adj.multiply(1.0 / col_sum).tocsr()
 
     # Create restart vector r
     r = np.zeros((n, 1))
@@ -1,9 +1,39 @@
 """Shortest path analysis."""
 
+from collections import deque
+
 import numpy as np
-import networkx as nx
 
-def calculate_shortest_path(G, drug_targets, disease_genes):
+
+def distances_to_nearest(G, sources):
+    """
+    Hop distance from every node to its nearest source node.
+
+    One breadth-first search seeded with all sources at once, instead of a
+    shortest-path query per (node, source) pair.
+
+    Args:
+        G: NetworkX graph
+        sources: Source nodes (those absent from G are ignored)
+
+    Returns:
+        Dictionary of {node: distance} for nodes that reach a source
+    """
+    # Walk edges backwards on digraphs: distances are node -> source
+    neighbors = G.pred if G.is_directed() else G.adj
+    dist = dict.fromkeys((s for s in sources if s in G), 0)
+    queue = deque(dist)
+    while queue:
+        node = queue.popleft()
+        d = dist[node] + 1
+        for nbr in neighbors[node]:
+            if nbr not in dist:
+                dist[nbr] = d
+                queue.append(nbr)
+    return dist
+
+
+def calculate_shortest_path(G, drug_targets, disease_genes, distances=None):
     """
     Calculate shortest-path proximity (d_c).
 
@@ -13,26 +43,21 @@ def calculate_shortest_path(G, drug_targets, disease_genes):
         G: NetworkX graph
         drug_targets: List of target genes
         disease_genes: List of disease genes
+        distances: Optional precomputed distances_to_nearest(G, disease_genes),
+            reused when the same disease genes are scored many times
 
     Returns:
         Mean minimum distance
     """
     targets_in = [t for t in drug_targets if t in G]
-    disease_in = [d for d in disease_genes if d in G]
-
-    if not targets_in or not disease_in:
-        return np.nan
-
-    distances = []
-    for target in targets_in:
-        min_dist = float('inf')
-        for disease in disease_in:
-            try:
-                dist = nx.shortest_path_length(G, target, disease)
-                min_dist = min(min_dist, dist)
-            except nx.NetworkXNoPath:
-                continue
-        if min_dist != float('inf'):
-            distances.append(min_dist)
-
-    return np.mean(distances) if distances else np.nan
+
+    if distances is None:
+        disease_in = [d for d in disease_genes if d in G]
+        if not targets_in or not disease_in:
+            return np.nan
+        distances = distances_to_nearest(G, disease_in)
+
+    # Targets that reach no disease gene are left out, as before
+    reached = [distances[t] for t in targets_in if t in distances]
+
+    return np.mean(reached) if reached else np.nan
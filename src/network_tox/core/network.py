@@ -1,40 +1,201 @@
 """Core network operations."""
 
 import networkx as nx
+import numpy as np
 import pandas as pd
-import gzip
+import pickle
+from collections import deque
+from pathlib import Path
+import pyarrow as pa
+from pyarrow import csv as pacsv, compute as pc
+import pyarrow.parquet as pq
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
 
+from ..utils.data_loader import load_protein_to_gene
 
-def load_string_network(threshold, links_file, info_file):
+# STRING links: "protein1 protein2 combined_score", space-delimited;
+# scores are at most 1000
+LINKS_COLUMNS = {
+    'protein1': pa.string(),
+    'protein2': pa.string(),
+    'combined_score': pa.int16(),
+}
+
+
+def largest_component_nodes(sources, targets):
     """
-    Load STRING network at specified confidence threshold.
+    Node set of the largest connected component of an undirected edge list.
+    
+    Components are labelled by SciPy on integer-coded endpoints, so no
+    NetworkX graph is built. Ties go to the component whose first node
+    appears earliest, as with max(nx.connected_components(G), key=len).
+    
+    Args:
+        sources: First endpoint of each edge
+        targets: Second endpoint of each edge
+        
+    Returns:
+        Set of nodes in the largest component (empty for no edges)
+    """
+    # Interleave endpoints so codes follow NetworkX node insertion order
+    endpoints = np.column_stack([np.asarray(sources), np.asarray(targets)]).ravel()
+    codes, uniques = pd.factorize(endpoints)
+    n = len(uniques)
+    if n == 0:
+        return set()
+    
+    adj = sparse.csr_array(
+        (np.ones(len(codes) // 2), (codes[0::2], codes[1::2])), shape=(n, n)
+    )
+    _, labels = connected_components(adj, directed=False)
+    return set(uniques[labels == np.bincount(labels).argmax()].tolist())
+
+
+def load_edgelist_graph(path, cache_path=None):
+    """
+    Load a Parquet edge list as a NetworkX graph, cached as a pickle.
+    
+    The first call builds the graph and pickles it (by default as
+    ``<name>.graph.pkl`` next to the edge list), preceded by the edge
+    list's size and mtime and the NetworkX version. Later calls unpickle
+    the graph only while all three still match; otherwise it is rebuilt.
+    
+    Args:
+        path: Parquet edge list (protein1/protein2, gene1/gene2,
+            source/target, or else its first two columns)
+        cache_path: Where to keep the pickled graph
+        
+    Returns:
+        NetworkX graph
+    """
+    path = Path(path)
+    cache_path = Path(cache_path) if cache_path else path.with_suffix('.graph.pkl')
+    stat = path.stat()
+    key = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'networkx': nx.__version__}
+    
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'rb') as f:
+                if pickle.load(f) == key:
+                    return pickle.load(f)
+        except Exception:
+            pass  # unreadable or old-format cache: rebuild below
+    
+    columns = pq.read_schema(path).names
+    for col1, col2 in [('protein1', 'protein2'), ('gene1', 'gene2'), ('source', 'target')]:
+        if col1 in columns and col2 in columns:
+            break
+    else:
+        col1, col2 = columns[:2]
+    
+    df = pd.read_parquet(path, columns=[col1, col2])
+    G = nx.from_pandas_edgelist(df, col1, col2)
+    
+    with open(cache_path, 'wb') as f:
+        pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return G
+
+
+def load_string_links(threshold, links_file, cache_path=None):
+    """
+    Read the STRING links at or above a confidence threshold, cached as Parquet.
+    
+    The first call parses the gzip with Arrow's multi-threaded CSV reader,
+    filters on combined_score and writes the result (by default as
+    ``string_links_ge<threshold>_<links name>.parquet`` next to the links
+    file); later calls read that cache while it is at least as new as the
+    links file.
     
     Args:
         threshold: Minimum combined score
         links_file: Path to string_links.txt.gz
-        info_file: Path to string_info.txt.gz
+        cache_path: Where to keep the filtered links
         
     Returns:
-        NetworkX graph (LCC)
+        pyarrow Table with protein1, protein2, combined_score columns
     """
-    with gzip.open(info_file, 'rt') as f:
-        df_info = pd.read_csv(f, sep='\t')
-    id_map = dict(zip(df_info['#string_protein_id'], df_info['preferred_name']))
+    links_file = Path(links_file)
+    if cache_path is None:
+        # Full source name (minus .txt.gz) so different links files never
+        # share a cache, e.g. string_links_ge700_9606.protein.links.v12.0.parquet
+        source = links_file.name.removesuffix('.gz').removesuffix('.txt')
+        cache_path = links_file.with_name(f'string_links_ge{threshold}_{source}.parquet')
+    cache_path = Path(cache_path)
     
-    with gzip.open(links_file, 'rt') as f:
-        df_links = pd.read_csv(f, sep=' ')
+    if cache_path.exists() and cache_path.stat().st_mtime >= links_file.stat().st_mtime:
+        return pq.read_table(cache_path)
     
-    df = df_links[df_links['combined_score'] >= threshold].copy()
+    table = pacsv.read_csv(
+        links_file,
+        parse_options=pacsv.ParseOptions(delimiter=' '),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(LINKS_COLUMNS),
+            column_types=LINKS_COLUMNS,
+        ),
+    )
+    table = table.filter(pc.greater_equal(table['combined_score'], threshold))
+    
+    pq.write_table(table, cache_path, compression='zstd')
+    return table
+
+
+def load_string_edges(threshold, links_file, info_file):
+    """
+    Load the STRING edge list (LCC) at a confidence threshold.
+    
+    Same filtering as load_string_network, for callers that only need
+    the edges and would otherwise convert the graph straight back. The
+    thresholded links and the protein -> gene mapping are both read
+    through their Parquet caches.
+    
+    Args:
+        threshold: Minimum combined score
+        links_file: Path to string_links.txt.gz
+        info_file: Path to string_info.txt.gz
+        
+    Returns:
+        DataFrame with gene1, gene2 columns (LCC edges only)
+    """
+    id_map = load_protein_to_gene(info_file)
+    
+    df = load_string_links(threshold, links_file).to_pandas()
     df['gene1'] = df['protein1'].map(id_map)
     df['gene2'] = df['protein2'].map(id_map)
     df = df.dropna(subset=['gene1', 'gene2'])
     
-    G = nx.Graph()
-    G.add_edges_from(zip(df['gene1'], df['gene2']))
+    # Extract LCC on the edge list (an edge touching the LCC lies entirely
+    # inside it)
+    lcc = largest_component_nodes(df['gene1'], df['gene2'])
+    edges = df.loc[df['gene1'].isin(lcc), ['gene1', 'gene2']]
     
-    # Extract LCC
-    lcc = max(nx.connected_components(G), key=len)
-    return G.subgraph(lcc).copy()
+    # STRING lists each link in both directions: keep the first row of every
+    # undirected pair, as the graph holds it
+    u = edges['gene1'].to_numpy()
+    v = edges['gene2'].to_numpy()
+    swap = u > v
+    pairs = pd.DataFrame({'a': np.where(swap, v, u), 'b': np.where(swap, u, v)})
+    return edges[~pairs.duplicated().to_numpy()].reset_index(drop=True)
+
+
+def load_string_network(threshold, links_file, info_file):
+    """
+    Load STRING network at specified confidence threshold.
+    
+    Args:
+        threshold: Minimum combined score
+        links_file: Path to string_links.txt.gz
+        info_file: Path to string_info.txt.gz
+        
+    Returns:
+        NetworkX graph (LCC)
+    """
+    edges = load_string_edges(threshold, links_file, info_file)
+    
+    G = nx.Graph()
+    G.add_edges_from(zip(edges['gene1'], edges['gene2']))
+    return G
 
 
 def filter_to_tissue(G, tissue_genes):
@@ -48,13 +209,26 @@ def filter_to_tissue(G, tissue_genes):
     Returns:
         Filtered graph (LCC)
     """
-    nodes = [n for n in G.nodes() if n in tissue_genes]
-    G_tissue = G.subgraph(nodes).copy()
+    tissue = set(tissue_genes)
     
-    if len(G_tissue) > 0:
-        components = list(nx.connected_components(G_tissue))
-        if len(components) > 1:
-            lcc = max(components, key=len)
-            return G_tissue.subgraph(lcc).copy()
+    # BFS over G restricted to tissue nodes, so the tissue subgraph is never
+    # copied; only the largest component found is. Starts follow G's node
+    # order and ties keep the first component, as max(connected_components)
+    seen = set()
+    lcc = set()
+    for start in G:
+        if start not in tissue or start in seen:
+            continue
+        component = {start}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for nbr in G.adj[node]:
+                if nbr in tissue and nbr not in component:
+                    component.add(nbr)
+                    queue.append(nbr)
+        seen |= component
+        if len(component) > len(lcc):
+            lcc = component
     
-    return G_tissue
+    return G.subgraph(lcc).copy()
@@ -25,17 +25,20 @@ def get_degree_matched_random(G, targets, n_sample, seed=None):
     
     random_set = []
     nodes = list(G.nodes())
+    # Set lookups keep each candidate scan O(N) rather than O(N * |targets|)
+    excluded = set(targets)
     
     for deg in target_degrees[:n_sample]:
         tol = max(1, int(deg * 0.25))
         candidates = [n for n in nodes 
                      if abs(degrees[n] - deg) <= tol 
-                     and n not in targets 
-                     and n not in random_set]
+                     and n not in excluded]
         if not candidates:
-            candidates = [n for n in nodes if n not in targets and n not in random_set]
+            candidates = [n for n in nodes if n not in excluded]
         if candidates:
-            random_set.append(np.random.choice(candidates))
+            pick = np.random.choice(candidates)
+            random_set.append(pick)
+            excluded.add(pick)
     
     return random_set
 
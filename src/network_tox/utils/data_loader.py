@@ -1,43 +1,138 @@
+import csv
+import gzip
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
+import pyarrow.parquet as pq
+from pathlib import Path
 
-def load_liver_genes(gtex_path):
+# Parquet writer options for every pipeline output: zstd pages,
+# dictionary-encoded gene columns and min/max statistics per row group
+# so readers can skip groups
+PARQUET_OPTIONS = {
+    'compression': 'zstd',
+    'compression_level': 3,
+    'row_group_size': 256_000,
+    'write_statistics': True,
+    'use_dictionary': True,
+}
+
+
+def load_gtex_liver(gtex_path):
     """
-    Reads the GTEx GCT file, filters for Liver columns, and returns a set of gene symbols
-    where the median TPM is greater than 1.
+    Reads the gene symbol and Liver TPM columns from the GTEx GCT file.
+
+    The first call parses the GCT file and writes a Parquet cache next to it
+    (``<name>.liver.parquet``); subsequent calls read the cache instead.
 
     Args:
-        gtex_path (str): Path to the GTEx GCT file.
+        gtex_path (str or Path): Path to the GTEx GCT file.
 
     Returns:
-        set: A set of gene symbols (strings).
+        pandas.DataFrame: Columns 'Description' (gene symbol) and 'Liver' (float32 TPM).
     """
-    # Load the dataset, skipping the first 2 header lines
-    df = pd.read_csv(gtex_path, sep='\t', skiprows=2)
+    gtex_path = Path(gtex_path)
+    cache_path = gtex_path.with_suffix('.liver.parquet')
+
+    if cache_path.exists() and cache_path.stat().st_mtime >= gtex_path.stat().st_mtime:
+        return pd.read_parquet(cache_path)
+
+    # Check the header first so a missing column gives a clear error
+    header = pd.read_csv(gtex_path, sep='\t', skiprows=2, nrows=0)
+    if 'Liver' not in header.columns:
+        raise ValueError("No 'Liver' column found in the dataset.")
+
+    # Arrow's multi-threaded parser decodes only the two columns used;
+    # the other ~50 tissue columns are skipped rather than converted
+    table = pacsv.read_csv(
+        gtex_path,
+        read_options=pacsv.ReadOptions(skip_rows=2),
+        parse_options=pacsv.ParseOptions(delimiter='\t'),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=['Description', 'Liver'],
+            column_types={'Description': pa.string(), 'Liver': pa.float32()},
+        ),
+    )
+    df = table.to_pandas()
 
-    # Filter for columns containing 'Liver' and the gene symbol column 'Description'
-    liver_cols = [col for col in df.columns if 'Liver' in col]
+    df.to_parquet(cache_path, compression='snappy', index=False)
+    return df
 
-    if not liver_cols:
-        raise ValueError("No columns containing 'Liver' found in the dataset.")
 
-    # We also need the 'Description' column which contains gene symbols
-    cols_to_keep = ['Description'] + liver_cols
-    df_liver = df[cols_to_keep]
+def load_liver_genes(gtex_path):
+    """
+    Reads the GTEx GCT file and returns the set of gene symbols whose Liver
+    median TPM is greater than 1.
 
-    # Calculate median TPM across liver columns (though usually there is only one "Liver" column in this file,
-    # or if there are multiple, we take the median across them per row)
-    # The instructions say "calculate the median TPM". Since we filtered for liver columns,
-    # if there is more than one, we take the median. If there is one, it's just the value.
-    # We convert to numeric just in case
-    for col in liver_cols:
-        df_liver.loc[:, col] = pd.to_numeric(df_liver[col], errors='coerce')
+    Args:
+        gtex_path (str): Path to the GTEx GCT file.
 
-    # Calculate median across the liver columns
-    # axis=1 operates on rows.
-    df_liver.loc[:, 'median_tpm'] = df_liver[liver_cols].median(axis=1)
+    Returns:
+        set: A set of gene symbols (strings).
+    """
+    df_liver = load_gtex_liver(gtex_path)
 
     # Filter where Median TPM > 1
-    expressed_genes = df_liver[df_liver['median_tpm'] > 1]['Description']
+    expressed_genes = df_liver[df_liver['Liver'] > 1]['Description']
 
     # Return as a set of unique gene symbols
     return set(expressed_genes.unique())
+
+
+def load_int_edgelist(edges_path, nodes_path):
+    """
+    Reads an integer-coded edge list and its node table.
+
+    Written by create_lcc_filtered_data.py next to each liver LCC network:
+    ``<name>_int.parquet`` holds int32 'src'/'dst' node IDs, and
+    ``<name>_nodes.parquet`` maps 'node_id' to 'gene_symbol'.
+
+    Args:
+        edges_path (str or Path): Path to the int32 edge list.
+        nodes_path (str or Path): Path to the node table.
+
+    Returns:
+        tuple: (src, dst, nodes) where src/dst are int32 arrays and nodes[i]
+        is the gene symbol of node ID i.
+    """
+    edges = pq.read_table(edges_path, columns=['src', 'dst'])
+    nodes = pq.read_table(nodes_path).to_pandas().sort_values('node_id')
+    return (
+        edges['src'].to_numpy(),
+        edges['dst'].to_numpy(),
+        nodes['gene_symbol'].tolist(),
+    )
+
+
+def load_protein_to_gene(info_file, cache_path=None):
+    """
+    Reads the STRING protein info file as a protein_id -> gene symbol mapping.
+
+    The first call decompresses and parses the gzip file and writes a Parquet
+    cache (by default ``protein_to_gene.parquet`` next to it); subsequent
+    calls read the cache instead.
+
+    Args:
+        info_file (str or Path): Path to string_info.txt.gz.
+        cache_path (str or Path, optional): Where to keep the Parquet cache.
+
+    Returns:
+        dict: STRING protein ID (e.g. '9606.ENSP00000000233') -> gene symbol.
+    """
+    info_file = Path(info_file)
+    cache_path = Path(cache_path) if cache_path else info_file.with_name('protein_to_gene.parquet')
+
+    if cache_path.exists() and cache_path.stat().st_mtime >= info_file.stat().st_mtime:
+        df = pd.read_parquet(cache_path)
+    else:
+        with gzip.open(info_file, 'rt') as f:
+            # First two columns only; annotations may contain quotes and
+            # symbols such as "NA" must stay strings
+            df = pd.read_csv(
+                f, sep='\t', header=0, usecols=[0, 1], names=['protein_id', 'gene_symbol'],
+                dtype=str, quoting=csv.QUOTE_NONE, keep_default_na=False,
+            )
+        df.to_parquet(cache_path, compression='snappy', index=False)
+
+    # Later rows win for repeated IDs
+    return dict(zip(df['protein_id'], df['gene_symbol']))
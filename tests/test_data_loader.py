@@ -126,3 +126,87 @@ def test_network_file_structure():
     # Verify network size is reasonable
     assert len(df) > 50000, f"Network too small: {len(df)} edges"
 
+
+
+# GTEx Loader Tests
+
+def _write_gct(path):
+    """Write a minimal GTEx-style GCT file."""
+    path.write_text(
+        "#1.2\n"
+        "3\t2\n"
+        "Name\tDescription\tAdipose - Subcutaneous\tLiver\n"
+        "ENSG1\tGENE_A\t1.0\t5.5\n"
+        "ENSG2\tGENE_B\t2.0\t0.5\n"
+        "ENSG3\tGENE_C\t3.0\t12.25\n"
+    )
+
+
+def test_load_gtex_liver_writes_parquet_cache(tmp_path):
+    """Test GTEx liver loader projects columns and caches as Parquet."""
+    from network_tox.utils.data_loader import load_gtex_liver
+
+    gct = tmp_path / 'gtex.gct'
+    _write_gct(gct)
+
+    df = load_gtex_liver(gct)
+    cache = tmp_path / 'gtex.liver.parquet'
+
+    assert list(df.columns) == ['Description', 'Liver']
+    assert df['Liver'].dtype == 'float32'
+    assert cache.exists()
+
+    cached = load_gtex_liver(gct)
+    pd.testing.assert_frame_equal(df, cached)
+
+
+def test_load_liver_genes_threshold(tmp_path):
+    """Test load_liver_genes keeps genes with Liver TPM > 1."""
+    from network_tox.utils.data_loader import load_liver_genes
+
+    gct = tmp_path / 'gtex.gct'
+    _write_gct(gct)
+
+    assert load_liver_genes(gct) == {'GENE_A', 'GENE_C'}
+
+
+def test_load_protein_to_gene_writes_parquet_cache(tmp_path):
+    """Test STRING info loader keeps symbols verbatim and caches as Parquet."""
+    import gzip
+    from network_tox.utils.data_loader import load_protein_to_gene
+
+    info = tmp_path / 'string_info.txt.gz'
+    with gzip.open(info, 'wt') as f:
+        f.write(
+            "#string_protein_id\tpreferred_name\tprotein_size\tannotation\n"
+            "9606.ENSP01\tARF5\t180\tADP-ribosylation \"factor\" 5\n"
+            "9606.ENSP02\tNA\t200\tannotation not available\n"
+        )
+
+    mapping = load_protein_to_gene(info)
+    cache = tmp_path / 'protein_to_gene.parquet'
+
+    assert mapping == {'9606.ENSP01': 'ARF5', '9606.ENSP02': 'NA'}
+    assert cache.exists()
+    assert load_protein_to_gene(info) == mapping
+
+
+def test_load_int_edgelist_matches_string_adjacency(tmp_path):
+    """Test int-coded edge list rebuilds the string edge list's adjacency."""
+    import numpy as np
+    from network_tox.analysis.expression_weighted_rwr import adjacency_from_codes, adjacency_from_edges
+    from network_tox.utils.data_loader import load_int_edgelist
+
+    edges = pd.DataFrame({'gene1': ['B', 'A', 'C', 'A'], 'gene2': ['C', 'B', 'D', 'D']})
+    codes, genes = pd.factorize(edges[['gene1', 'gene2']].to_numpy().ravel())
+    codes = codes.astype(np.int32)
+    pd.DataFrame({'src': codes[0::2], 'dst': codes[1::2]}).to_parquet(tmp_path / 'net_int.parquet')
+    pd.DataFrame({'node_id': np.arange(len(genes), dtype=np.int32), 'gene_symbol': genes}).to_parquet(
+        tmp_path / 'net_nodes.parquet')
+
+    src, dst, nodes = load_int_edgelist(tmp_path / 'net_int.parquet', tmp_path / 'net_nodes.parquet')
+    expected, expected_nodes = adjacency_from_edges(edges['gene1'], edges['gene2'])
+
+    assert src.dtype == np.int32
+    assert nodes == expected_nodes
+    assert (adjacency_from_codes(src, dst, len(nodes)) != expected).nnz == 0
@@ -0,0 +1,192 @@
+"""
+Unit tests for Expression-Weighted Random Walk with Restart.
+"""
+
+import pytest
+import networkx as nx
+import numpy as np
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'src'))
+
+from network_tox.analysis.expression_weighted_rwr import (
+    ExpressionWeightedRWR,
+    adjacency_from_edges,
+    create_expression_weighted_transition_matrix,
+    expression_array,
+    get_degree_matched_random_seeds,
+    load_liver_expression,
+    run_expression_weighted_rwr,
+    run_expression_weighted_rwr_from_adjacency,
+    run_standard_rwr,
+    run_standard_rwr_from_adjacency,
+)
+
+
+def _karate_with_expression():
+    G = nx.relabel_nodes(nx.karate_club_graph(), str)
+    rng = np.random.default_rng(42)
+    expression = dict(zip(G.nodes(), rng.lognormal(3, 1, size=len(G)).tolist()))
+    return G, expression
+
+
+def test_rwr_matches_closed_form():
+    """Converged scores equal c * (I - (1-c) W')^-1 q."""
+    G, expression = _karate_with_expression()
+    nodes = list(G.nodes())
+    seeds = ['0', '33']
+    c = 0.15
+
+    adj = nx.to_scipy_sparse_array(G, nodelist=nodes, dtype=float)
+    W = create_expression_weighted_transition_matrix(adj, expression, nodes).toarray()
+    q = np.array([1.0 / len(seeds) if n in seeds else 0.0 for n in nodes])
+    expected = c * np.linalg.solve(np.eye(len(nodes)) - (1 - c) * W, q)
+
+    scores = run_expression_weighted_rwr(G, seeds, expression, restart_prob=c, tol=1e-12, max_iter=1000)
+
+    assert np.allclose([scores[n] for n in nodes], expected, atol=1e-10)
+
+
+def test_rwr_conserves_mass():
+    """Scores sum to 1 on a connected graph."""
+    G, expression = _karate_with_expression()
+
+    scores = run_expression_weighted_rwr(G, ['0'], expression, tol=1e-10, max_iter=1000)
+
+    total = np.fromiter(scores.values(), dtype=np.float64, count=len(scores)).sum()
+    assert total == pytest.approx(1.0, abs=1e-8)
+
+
+def test_rwr_no_valid_seeds():
+    """Seeds absent from the graph give all-zero scores."""
+    G, expression = _karate_with_expression()
+
+    scores = run_expression_weighted_rwr(G, ['missing'], expression)
+
+    assert set(scores) == set(G.nodes())
+    assert all(v == 0.0 for v in scores.values())
+
+
+def test_adjacency_from_edges_matches_networkx():
+    """Edge-list CSR equals the NetworkX adjacency, including duplicates and self-loops."""
+    import pandas as pd
+
+    edges = pd.DataFrame({
+        'gene1': ['A', 'B', 'C', 'B', 'D', 'E'],
+        'gene2': ['B', 'C', 'A', 'A', 'D', 'A'],
+    })
+    G = nx.from_pandas_edgelist(edges, 'gene1', 'gene2')
+
+    adj, nodes = adjacency_from_edges(edges['gene1'], edges['gene2'])
+
+    assert nodes == list(G.nodes())
+    expected = nx.to_scipy_sparse_array(G, nodelist=nodes, dtype=float)
+    # Compare stored entries only; no dense n x n copies
+    assert (adj != expected).nnz == 0
+
+
+def test_rwr_from_edges_matches_graph():
+    """Edge-list entry points give the same scores as the NetworkX ones."""
+    G, expression = _karate_with_expression()
+    G = nx.Graph(G.edges())  # drop karate's edge weights, as for a plain edge list
+    sources, targets = zip(*G.edges())
+    seeds = ['0', '33']
+
+    adj, nodes = adjacency_from_edges(sources, targets)
+
+    assert run_expression_weighted_rwr_from_adjacency(adj, nodes, seeds, expression) == pytest.approx(
+        run_expression_weighted_rwr(G, seeds, expression), abs=1e-12)
+    assert run_standard_rwr_from_adjacency(adj, nodes, seeds) == pytest.approx(
+        run_standard_rwr(G, seeds), abs=1e-12)
+
+
+def test_prebuilt_rwr_reuses_adjacency():
+    """One ExpressionWeightedRWR solves several expression profiles like fresh calls."""
+    G = nx.path_graph([f'G{i}' for i in range(6)])
+    nodes = list(G.nodes())
+    profiles = [
+        dict.fromkeys(nodes, 10.0),
+        {'G0': 100.0, 'G5': 0.0},
+        dict(zip(nodes, [0.0, 1.0, 1000.0, 1.0, 0.0, 5.0])),
+    ]
+
+    rwr = ExpressionWeightedRWR.from_graph(G)
+
+    for expression in profiles:
+        assert rwr.solve(['G0'], expression) == run_expression_weighted_rwr(G, ['G0'], expression)
+        assert rwr.solve(['G5'], expression) == run_expression_weighted_rwr(G, ['G5'], expression)
+
+
+def test_degree_matched_seeds_within_tolerance():
+    """Sampled seeds are expressed, distinct and degree-matched to ±25%."""
+    import random
+
+    G, expression = _karate_with_expression()
+    seeds = ['0', '33', '5']
+
+    random.seed(0)
+    sampled = get_degree_matched_random_seeds(G, seeds, expression)
+
+    assert len(sampled) == len(seeds)
+    assert len(set(sampled)) == len(sampled)
+    for seed, node in zip(seeds, sampled):
+        deg = G.degree(seed)
+        assert int(deg * 0.75) <= G.degree(node) <= int(deg * 1.25)
+
+
+def test_transition_matrix_accepts_aligned_array():
+    """A node-aligned expression array gives the same matrix as the dictionary."""
+    G, expression = _karate_with_expression()
+    nodes = list(G.nodes())
+    adj = nx.to_scipy_sparse_array(G, nodelist=nodes, dtype=float)
+
+    W_dict = create_expression_weighted_transition_matrix(adj, expression, nodes)
+    W_arr = create_expression_weighted_transition_matrix(adj, expression_array(expression, nodes), nodes)
+
+    assert (W_dict != W_arr).nnz == 0
+    with pytest.raises(ValueError):
+        create_expression_weighted_transition_matrix(adj, np.ones(3), nodes)
+
+
+def test_cpi_kernel_matches_scipy_loop():
+    """The numba-compilable CSR kernel (run here as plain Python) matches SciPy."""
+    from network_tox.analysis import expression_weighted_rwr as ewr
+
+    G, expression = _karate_with_expression()
+    nodes = list(G.nodes())
+    adj = nx.to_scipy_sparse_array(G, nodelist=nodes, dtype=float)
+    W = create_expression_weighted_transition_matrix(adj, expression, nodes).tocsr()
+    q = np.zeros(len(nodes))
+    q[[0, 33]] = 0.5
+
+    kernel = ewr._cpi_csr(W.indptr, W.indices, W.data, q, 0.15, 1e-10, 1000)
+
+    x = 0.15 * q
+    expected = x.copy()
+    for _ in range(1000):
+        x = 0.85 * W.dot(x)
+        expected += x
+        if np.abs(x).sum() < 1e-10:
+            break
+
+    assert np.allclose(kernel, expected, atol=1e-14)
+
+
+def test_load_liver_expression(tmp_path):
+    """GCT loader returns symbol -> TPM for the requested tissue column."""
+    gct = tmp_path / 'gtex.gct'
+    gct.write_text(
+        "#1.2\n"
+        "3\t2\n"
+        "Name\tDescription\tAdipose - Subcutaneous\tLiver\n"
+        "ENSG1\tGENE_A\t1.0\t5.5\n"
+        "ENSG2\tGENE_B\t2.0\t0\n"
+        "ENSG3\tGENE_C\t3.0\t12.25\n"
+    )
+
+    assert load_liver_expression(gct) == {'GENE_A': 5.5, 'GENE_B': 0.0, 'GENE_C': 12.25}
+    assert load_liver_expression(gct, 'Adipose - Subcutaneous')['GENE_B'] == 2.0
+    with pytest.raises(ValueError):
+        load_liver_expression(gct, 'Brain')
@@ -12,7 +12,14 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.network_tox.core.network import filter_to_tissue
+from src.network_tox.core.network import (
+    filter_to_tissue,
+    largest_component_nodes,
+    load_edgelist_graph,
+    load_string_edges,
+    load_string_links,
+    load_string_network,
+)
 
 
 class TestFilterToTissue:
@@ -178,3 +185,122 @@ class TestFilterToTissueEdgeCases:
         # Modifying result shouldn't affect original
         result.add_node('NEW')
         assert 'NEW' not in G
+
+
+class TestLargestComponentNodes:
+    """Tests for largest_component_nodes."""
+    
+    def test_matches_networkx(self):
+        """Same node set as the NetworkX LCC on a fragmented graph."""
+        G = nx.gnm_random_graph(200, 150, seed=7)
+        sources, targets = zip(*G.edges())
+        
+        expected = max(nx.connected_components(G.edge_subgraph(G.edges())), key=len)
+        
+        assert largest_component_nodes(sources, targets) == expected
+    
+    def test_tie_keeps_first_component(self):
+        """Equal-size components resolve to the one seen first."""
+        result = largest_component_nodes(['X', 'A'], ['Y', 'B'])
+        
+        assert result == {'X', 'Y'}
+    
+    def test_empty_edge_list(self):
+        """No edges gives an empty set."""
+        assert largest_component_nodes([], []) == set()
+
+
+class TestLoadEdgelistGraph:
+    """Tests for load_edgelist_graph."""
+    
+    def test_builds_and_reuses_pickle_cache(self, tmp_path):
+        """Graph matches from_pandas_edgelist and is cached next to the file."""
+        import pandas as pd
+        
+        path = tmp_path / 'net.parquet'
+        df = pd.DataFrame({'gene1': ['A', 'B', 'C'], 'gene2': ['B', 'C', 'A'], 'score': [900, 950, 990]})
+        df.to_parquet(path)
+        
+        G = load_edgelist_graph(path)
+        cached = load_edgelist_graph(path)
+        
+        assert (tmp_path / 'net.graph.pkl').exists()
+        assert nx.utils.graphs_equal(G, nx.from_pandas_edgelist(df, 'gene1', 'gene2'))
+        assert nx.utils.graphs_equal(cached, G)
+    
+    def test_rebuilds_when_source_changes(self, tmp_path):
+        """A replaced edge list is reloaded even if its mtime goes backwards."""
+        import os
+        import pandas as pd
+        
+        path = tmp_path / 'net.parquet'
+        pd.DataFrame({'gene1': ['A'], 'gene2': ['B']}).to_parquet(path)
+        load_edgelist_graph(path)
+        
+        mtime = path.stat().st_mtime
+        pd.DataFrame({'gene1': ['A', 'B', 'C'], 'gene2': ['B', 'C', 'D']}).to_parquet(path)
+        os.utime(path, (mtime - 60, mtime - 60))
+        
+        assert set(load_edgelist_graph(path).nodes()) == {'A', 'B', 'C', 'D'}
+    
+    def test_rebuilds_old_format_cache(self, tmp_path):
+        """A bare pickled graph without the source key is replaced."""
+        import pickle
+        import pandas as pd
+        
+        path = tmp_path / 'net.parquet'
+        pd.DataFrame({'gene1': ['A'], 'gene2': ['B']}).to_parquet(path)
+        with open(tmp_path / 'net.graph.pkl', 'wb') as f:
+            pickle.dump(nx.path_graph(['X', 'Y']), f)
+        
+        assert set(load_edgelist_graph(path).nodes()) == {'A', 'B'}
+
+
+class TestLoadStringEdges:
+    """Tests for load_string_edges."""
+    
+    def test_edges_match_network(self, tmp_path):
+        """Thresholded, mapped LCC edges are exactly the graph's edges."""
+        import gzip
+        
+        info_file = tmp_path / 'string_info.txt.gz'
+        links_file = tmp_path / 'string_links.txt.gz'
+        with gzip.open(info_file, 'wt') as f:
+            f.write("#string_protein_id\tpreferred_name\n")
+            for i, gene in enumerate(['A', 'B', 'C', 'D', 'E', 'F']):
+                f.write(f"9606.P{i}\t{gene}\n")
+        with gzip.open(links_file, 'wt') as f:
+            f.write("protein1 protein2 combined_score\n")
+            f.write("9606.P0 9606.P1 900\n")  # A-B
+            f.write("9606.P1 9606.P2 800\n")  # B-C
+            f.write("9606.P1 9606.P0 900\n")  # B-A, reverse listing
+            f.write("9606.P2 9606.P1 800\n")  # C-B, reverse listing
+            f.write("9606.P2 9606.P3 500\n")  # below threshold
+            f.write("9606.P4 9606.P5 950\n")  # E-F, smaller component
+            f.write("9606.P0 9606.P9 990\n")  # unmapped protein
+        
+        edges = load_string_edges(700, links_file, info_file)
+        G = load_string_network(700, links_file, info_file)
+        
+        assert list(edges.columns) == ['gene1', 'gene2']
+        assert set(zip(edges['gene1'], edges['gene2'])) == {('A', 'B'), ('B', 'C')}
+        assert len(edges) == G.number_of_edges()
+        assert nx.utils.graphs_equal(G, nx.from_pandas_edgelist(edges, 'gene1', 'gene2'))
+    
+    def test_thresholded_links_cached(self, tmp_path):
+        """Filtered links are written per threshold and read back from Parquet."""
+        import gzip
+        
+        links_file = tmp_path / 'string_links.txt.gz'
+        with gzip.open(links_file, 'wt') as f:
+            f.write("protein1 protein2 combined_score\n")
+            f.write("9606.P0 9606.P1 900\n")
+            f.write("9606.P1 9606.P2 500\n")
+        
+        table = load_string_links(700, links_file)
+        cached = load_string_links(700, links_file)
+        
+        assert (tmp_path / 'string_links_ge700_string_links.parquet').exists()
+        assert table.column('protein2').to_pylist() == ['9606.P1']
+        assert cached.equals(table)
+        assert load_string_links(400, links_file).num_rows == 2
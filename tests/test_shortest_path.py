@@ -42,3 +42,20 @@ def test_calculate_shortest_path_no_overlap():
 
     d_c = shortest_path.calculate_shortest_path(G, ['X'], ['A'])
     assert np.isnan(d_c)
+
+def test_precomputed_distances_match_pairwise():
+    """Test multi-source distances give the pairwise minimum per target."""
+    G = nx.relabel_nodes(nx.karate_club_graph(), str)
+    G.add_edge('X', 'Y')  # component with no disease genes
+    targets = ['0', '5', '16', '26', 'X', 'missing']
+    disease = ['9', '24', '33']
+
+    distances = shortest_path.distances_to_nearest(G, disease)
+    expected = np.mean([
+        min(nx.shortest_path_length(G, t, d) for d in disease)
+        for t in ['0', '5', '16', '26']
+    ])
+
+    assert 'X' not in distances
+    assert shortest_path.calculate_shortest_path(G, targets, disease) == expected
+    assert shortest_path.calculate_shortest_path(G, targets, disease, distances) == expected